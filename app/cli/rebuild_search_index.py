@@ -0,0 +1,33 @@
+"""
+Bring the full-text search index (RESUME_SEARCH_INDEX_PATH) in line with the database.
+
+    python -m app.cli.rebuild_search_index [--full]
+
+By default the index is reconciled: resumes that are missing or changed since they were
+indexed are (re)indexed and deleted ones removed. --full empties the index and indexes every
+resume again. API workers on this host keep serving searches meanwhile.
+"""
+import argparse
+import time
+from app.config.logging_config import configure_logging
+from app.service.resume_service import search_index_source
+from app.utils.search_index import search_index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile or rebuild the resume search index.")
+    parser.add_argument("--full", action="store_true", help="empty the index and index every resume again")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    started = time.perf_counter()
+    if args.full:
+        search_index.rebuild(search_index_source.iter_documents())
+        print(f"Search index rebuilt with {search_index.count()} resumes in {time.perf_counter() - started:.1f}s.")
+    else:
+        upserted, removed = search_index.reconcile(search_index_source)
+        print(f"Search index reconciled in {time.perf_counter() - started:.1f}s: {upserted} (re)indexed, {removed} removed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Re-run field extraction over the stored resumes with the current parser.
+
+    python -m app.cli.reextract [--workers N] [--batch-size N] [--checkpoint PATH] [--all] [--restart]
+
+Resumes whose fields already come from pdf_utils.PARSER_VERSION are skipped unless --all is
+given. Stored text is reused, so a PDF is only decoded for resumes saved before text was
+kept. Progress is checkpointed after every committed batch, so an interrupted run carries on
+where it stopped; the checkpoint file is removed once the whole corpus has been processed.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from app.config.database import SessionLocal
+from app.config.logging_config import configure_logging
+from app.config.resume_config import ResumeConfig
+from app.repository.resume_repository import ResumeRepository
+from app.utils.pdf_utils import PARSER_VERSION, load_nlp, reextract_fields
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT = "reextract.checkpoint.json"
+
+
+def reextract(workers: int, batch_size: int, checkpoint_path: str, reprocess_all: bool = False, restart: bool = False):
+    state = None if restart else _load_checkpoint(checkpoint_path, reprocess_all)
+    if state:
+        logger.info(f"Resuming after resume {state['last_resume_id']} ({state['processed']} done, {state['failed']} failed).")
+    else:
+        state = {"parser_version": PARSER_VERSION, "all": reprocess_all, "last_resume_id": None, "processed": 0, "failed": 0}
+    stale_before = None if reprocess_all else PARSER_VERSION
+    after = uuid.UUID(state["last_resume_id"]) if state["last_resume_id"] else None
+    started = time.perf_counter()
+
+    db_session = SessionLocal()
+    repository = ResumeRepository(db_session)
+    # Batches are read ahead and parsed out of order across workers, but applied (and
+    # checkpointed) strictly in resume_id order so the checkpoint never skips a batch
+    in_flight = deque()
+    exhausted = False
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=load_nlp) as pool:
+            while True:
+                while not exhausted and len(in_flight) < workers * 2:
+                    rows = repository.get_reextract_batch(after, batch_size, stale_before)
+                    db_session.commit()  # end the read transaction; don't hold it while workers parse
+                    if not rows:
+                        exhausted = True
+                        break
+                    after = rows[-1].resume_id
+                    items = [(r.resume_id, r.resume_url, r.text) for r in rows]
+                    in_flight.append((after, pool.submit(reextract_fields, items, ResumeConfig.NER_BATCH_SIZE)))
+                if not in_flight:
+                    break
+
+                last_resume_id, future = in_flight.popleft()
+                parsed, failed = [], 0
+                for resume_id, resume_data in future.result():
+                    if "error" in resume_data:
+                        failed += 1
+                        logger.warning(f"Re-extraction failed for resume {resume_id}: {resume_data['error']}")
+                    else:
+                        parsed.append((resume_id, resume_data))
+                repository.apply_reextracted_fields(parsed)
+
+                state["last_resume_id"] = str(last_resume_id)
+                state["processed"] += len(parsed)
+                state["failed"] += failed
+                _save_checkpoint(checkpoint_path, state)
+                elapsed = time.perf_counter() - started
+                logger.info(f"{state['processed']} resumes re-extracted, {state['failed']} failed ({elapsed:.1f}s).")
+    finally:
+        db_session.close()
+
+    # Finished: the next run starts from scratch and only picks up what is still stale (e.g. failures)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return state
+
+
+def _load_checkpoint(path, reprocess_all):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    # A checkpoint from another parser version or mode belongs to a different run
+    if state.get("parser_version") != PARSER_VERSION or state.get("all") != reprocess_all:
+        logger.info(f"Ignoring checkpoint {path} from a different run.")
+        return None
+    return state
+
+
+def _save_checkpoint(path, state):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run resume field extraction with the current parser.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parse worker processes")
+    parser.add_argument("--batch-size", type=int, default=200, help="resumes per worker task and per commit")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="progress file used to resume an interrupted run")
+    parser.add_argument("--all", action="store_true", help="also re-extract resumes already at the current parser version")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    state = reextract(args.workers, args.batch_size, args.checkpoint, reprocess_all=args.all, restart=args.restart)
+    print(f"Done: {state['processed']} resumes re-extracted at parser version {PARSER_VERSION}, {state['failed']} failed.")
+
+
+if __name__ == "__main__":
+    main()
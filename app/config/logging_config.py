@@ -0,0 +1,129 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from app.config.resume_config import ResumeConfig
+
+# Attributes every LogRecord has; anything else on a record came in through `extra=` and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: QueueListener | None = None
+_lock = threading.Lock()
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, plus any `extra=` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most `limit` records per call site (logger, file, line) through per `window`
+    seconds, for records of the `loggers` given (and their children) below WARNING; everything
+    else always passes. Per-row messages in loops collapse to the first few, and the next
+    record from that call site reports how many were dropped.
+    """
+
+    def __init__(self, limit: int, window: float, loggers):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.loggers = tuple(loggers)
+        self._sites: dict[tuple, list] = {}  # call site -> [window start, passed, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.limit <= 0 or record.levelno >= logging.WARNING or not self._limits(record.name):
+            return True
+        site = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._sites[site] = [now, 1, 0]
+                if len(self._sites) > 10000:  # call sites are finite; this only guards against leaks
+                    self._sites.clear()
+            elif state[1] < self.limit:
+                state[1] += 1
+                return True
+            else:
+                state[2] += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+
+    def _limits(self, name):
+        return any(name == logger or name.startswith(logger + ".") for logger in self.loggers)
+
+
+def configure_logging():
+    """
+    Set up logging once per process (later calls do nothing).
+
+    Records are put on an in-memory queue by the calling thread and written to stderr by a
+    background listener thread, so a slow or contended stdout never stalls a request.
+    Settings come from LOG_LEVEL, LOG_LEVELS, LOG_FORMAT and LOG_RATE_LIMITED_LOGGERS/LOG_RATE_LIMIT/LOG_RATE_WINDOW.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+
+        output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(JSONFormatter() if ResumeConfig.LOG_FORMAT == "json" else logging.Formatter(_TEXT_FORMAT))
+
+        records = queue.SimpleQueue()
+        queue_handler = QueueHandler(records)
+        queue_handler.addFilter(_rate_limit_filter())
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(ResumeConfig.LOG_LEVEL)
+        for name, level in ResumeConfig.LOG_LEVELS.items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = QueueListener(records, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        # Forked children (e.g. the re-extraction CLI's workers) don't inherit the listener thread; log directly there
+        os.register_at_fork(after_in_child=lambda: _log_directly(root, queue_handler, output))
+
+
+def _rate_limit_filter():
+    return RateLimitFilter(ResumeConfig.LOG_RATE_LIMIT, ResumeConfig.LOG_RATE_WINDOW, ResumeConfig.LOG_RATE_LIMITED_LOGGERS)
+
+
+def _log_directly(root, queue_handler, output):
+    global _listener
+    _listener = None
+    root.removeHandler(queue_handler)
+    # A fresh filter: the parent's lock may have been held by another thread at fork time
+    output.addFilter(_rate_limit_filter())
+    root.addHandler(output)
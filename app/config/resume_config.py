@@ -4,3 +4,80 @@ class ResumeConfig:
     UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads')
     ALLOWED_EXTENSIONS = {'pdf'}
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # Max size of 16 MB for uploaded files
+    MAX_BATCH_CONTENT_LENGTH = int(os.getenv("RESUME_MAX_BATCH_CONTENT_LENGTH", 256 * 1024 * 1024))  # Whole batch request body
+    MAX_BATCH_EXPANDED_LENGTH = int(os.getenv("RESUME_MAX_BATCH_EXPANDED_LENGTH", 1024 * 1024 * 1024))  # Zip members of a batch, uncompressed
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # Uploads are written (and hashed) 1 MB at a time
+    PDF_MAGIC = b"%PDF-"
+
+    # Re-uploads of an identical PDF (same SHA-256) are never re-parsed or stored twice.
+    # "return_existing" answers with the stored resume; "link" creates a new record that shares the stored file.
+    DUPLICATE_POLICY = os.getenv("RESUME_DUPLICATE_POLICY", "return_existing")
+
+    # Background parsing: uploads are saved and parsed by a pool of worker processes
+    ASYNC_INGEST = os.getenv("RESUME_ASYNC_INGEST", "false").lower() in ("1", "true", "yes")
+    # Per API worker, and each parse process holds its own copy of the spaCy model, so keep it small
+    PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", 2))
+    PARSE_JOB_RETENTION_DAYS = int(os.getenv("RESUME_PARSE_JOB_RETENTION_DAYS", 7))  # finished jobs kept for status lookups
+
+    # Batch upload: files per request (after expanding zip archives) and spaCy nlp.pipe batch size
+    BATCH_MAX_FILES = int(os.getenv("RESUME_BATCH_MAX_FILES", 500))
+    NER_BATCH_SIZE = int(os.getenv("RESUME_NER_BATCH_SIZE", 32))
+
+    # spaCy: scan_pdf only needs NER, so the parser, lemmatizer and their inputs are excluded
+    SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+    SPACY_EXCLUDED_PIPES = [p.strip() for p in os.getenv("SPACY_EXCLUDED_PIPES", "tok2vec,parser,lemmatizer,tagger,attribute_ruler").split(",") if p.strip()]
+    SPACY_WARMUP = os.getenv("SPACY_WARMUP", "true").lower() in ("1", "true", "yes")  # load the model in parse workers at startup
+
+    # Skill taxonomy: {"skill_id": ["alias", ...]} compiled once per process into a single-pass matcher
+    SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(__file__), "skill_taxonomy.json"))
+
+    # Full-text search index (SQLite FTS5 file, shared by all API workers on the host)
+    SEARCH_INDEX_PATH = os.getenv("RESUME_SEARCH_INDEX_PATH", os.path.join(os.getcwd(), "resume_search.db"))
+    SEARCH_INDEX_RECONCILE_INTERVAL = int(os.getenv("RESUME_SEARCH_INDEX_RECONCILE_INTERVAL", 60))  # seconds between checks against the database
+
+    # Job-description ranking (in-memory BM25 matrix per API worker)
+    RANK_INDEX_TTL = int(os.getenv("RESUME_RANK_INDEX_TTL", 300))  # seconds before reloading to pick up other workers' writes
+    RANK_SKILL_WEIGHT = float(os.getenv("RESUME_RANK_SKILL_WEIGHT", 3.0))  # query weight of a skill found in the job description
+
+    # Boolean skill/area filter (in-memory bitmaps per API worker, optionally snapshotted to a file)
+    SKILL_BITMAP_PATH = os.getenv("SKILL_BITMAP_PATH") or None
+    SKILL_BITMAP_TTL = int(os.getenv("SKILL_BITMAP_TTL", 300))  # seconds before reloading to pick up other workers' writes
+
+    # Resume detail cache (assembled detail dicts per API worker; dropped on update/delete)
+    DETAIL_CACHE_SIZE = int(os.getenv("RESUME_DETAIL_CACHE_SIZE", 2048))
+    DETAIL_CACHE_TTL = float(os.getenv("RESUME_DETAIL_CACHE_TTL", 60))  # seconds; bounds staleness from other workers' writes
+
+    # GET /resume/export: rows fetched per server-side cursor round-trip
+    EXPORT_BATCH_SIZE = int(os.getenv("RESUME_EXPORT_BATCH_SIZE", 1000))
+
+    # POST /resume/details: ids per request
+    DETAILS_MAX_IDS = int(os.getenv("RESUME_DETAILS_MAX_IDS", 500))
+
+    # HTTP caching: detail responses are always revalidated (cheap 304s via ETag); PDFs may be reused for a while
+    DETAIL_CACHE_CONTROL = os.getenv("RESUME_DETAIL_CACHE_CONTROL", "private, no-cache")
+    PDF_CACHE_CONTROL = os.getenv("RESUME_PDF_CACHE_CONTROL", "private, max-age=3600")
+
+    # PDF text extraction limits (0 = no limit). Early stop ends extraction after the page holding the
+    # header (phone number); it skips the rest of long portfolios but also any skills listed past that page.
+    PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 10))
+    PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 100_000))
+    PDF_EARLY_STOP = os.getenv("PDF_EARLY_STOP", "false").lower() in ("1", "true", "yes")
+
+    # Sampling profiler, per request: send "X-Profile: 1" and a folded-stack profile is written to PROFILE_DIR
+    # (render with flamegraph.pl or speedscope). Off unless enabled; the header is ignored otherwise.
+    PROFILING_ENABLED = os.getenv("RESUME_PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+    PROFILE_DIR = os.getenv("RESUME_PROFILE_DIR", os.path.join(os.getcwd(), "profiles"))
+    PROFILE_INTERVAL = float(os.getenv("RESUME_PROFILE_INTERVAL", 0.005))  # seconds between samples
+
+    # Logging (see app.config.logging_config). LOG_LEVELS overrides single loggers, e.g.
+    # "sqlalchemy.engine=INFO,app.repository=DEBUG"; sqlalchemy.engine at INFO logs every SQL statement.
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_LEVELS = {
+        name.strip(): level.strip().upper()
+        for name, _, level in (item.partition("=") for item in os.getenv("LOG_LEVELS", "").split(",") if "=" in item)
+    }
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # "text" or "json" (one object per line)
+    # Rate limiting of repetitive per-row messages: only these loggers (and their children), and never WARNING or above
+    LOG_RATE_LIMITED_LOGGERS = [n.strip() for n in os.getenv("LOG_RATE_LIMITED_LOGGERS", "sqlalchemy.engine").split(",") if n.strip()]
+    LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", 20))  # records per call site per window; 0 = unlimited
+    LOG_RATE_WINDOW = float(os.getenv("LOG_RATE_WINDOW", 60))  # seconds
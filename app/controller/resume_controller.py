@@ -1,33 +1,38 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends,Query ,Request
-from fastapi.responses import JSONResponse ,FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from uuid import uuid4
 from app.service.resume_service import ResumeService
-from app.repository.resume_repository import ResumeRepository
-from app.repository.user_repository import UserRepository
-from app.config.database import SessionLocal
-from sqlalchemy.orm import Session
-from app.utils.security import get_current_user_username
+from app.repository.async_resume_repository import AsyncResumeRepository
+from app.repository.async_user_repository import AsyncUserRepository
+from app.config.database import AsyncSessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.security import get_current_user_username, require_read_access
+from app.utils.parse_jobs import parse_jobs
+from app.utils.http_cache import content_etag, file_etag, is_not_modified, not_modified_response
+from app.utils.metrics import JSONResponse
+from app.config.resume_config import ResumeConfig
 import logging
 from typing import List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from fastapi.encoders import jsonable_encoder
 import os
 router = APIRouter(prefix="/resume", tags=["Resume"])
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Dependency to get the database session
-def get_db():
-    db_session = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db_session:
         yield db_session
-    finally:
-        db_session.close()
 
    
 
 @router.post("/upload")
-async def upload_resume(resume: UploadFile = File(...), db_session: Session = Depends(get_db), operator: str = Depends(get_current_user_username)):
+async def upload_resume(
+    resume: UploadFile = File(...),
+    async_parse: bool = Query(ResumeConfig.ASYNC_INGEST, description="If true, queue parsing and return 202 with a job id"),
+    db_session: AsyncSession = Depends(get_db),
+    operator: str = Depends(get_current_user_username),
+):
 
     try:
         logger.info(f"Received file: {resume.filename}")
@@ -39,18 +44,72 @@ async def upload_resume(resume: UploadFile = File(...), db_session: Session = De
         if resume.filename.split('.')[-1].lower() not in ['pdf']:
             raise HTTPException(status_code=400, detail="Invalid file type. Only PDF allowed.")
 
-        resume_repository = ResumeRepository(db_session)
-        user_repository = UserRepository()
+        resume_repository = AsyncResumeRepository(db_session)
+        user_repository = AsyncUserRepository()
         resume_service = ResumeService(resume_repository, user_repository)
 
-        resume_detail = await resume_service.upload_resume(resume, operator, db_session)
+        if async_parse:
+            job, resume_detail = await resume_service.enqueue_resume(resume, operator)
+            if resume_detail is not None:
+                return JSONResponse(content=_duplicate_upload_content(resume_detail), status_code=200)
+            return JSONResponse(
+                content={
+                    "message": f"Resume {resume.filename} queued for parsing.",
+                    "job_id": job.job_id,
+                    "status": job.status,
+                    "status_url": f"{router.prefix}/jobs/{job.job_id}",
+                },
+                status_code=202,
+            )
+
+        resume_detail, duplicate = await resume_service.upload_resume(resume, operator, db_session)
+        if duplicate:
+            return JSONResponse(content=_duplicate_upload_content(resume_detail), status_code=200)
 
         return JSONResponse(content={"message": f"Resume {resume_detail.name} uploaded successfully!"}, status_code=200)
         
+    except HTTPException:
+        raise
     except Exception as e:
             logger.error(f"Error while uploading resume: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
     
+
+def _duplicate_upload_content(resume_detail):
+    return {
+        "message": f"Resume {resume_detail.name} was already uploaded.",
+        "duplicate": True,
+        "resume_id": str(resume_detail.resume_id),
+    }
+
+
+@router.post("/upload/batch")
+async def upload_resumes_batch(
+    resumes: List[UploadFile] = File(..., description="PDF files and/or zip archives of PDFs"),
+    db_session: AsyncSession = Depends(get_db),
+    operator: str = Depends(get_current_user_username),
+):
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No selected file")
+
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
+    resume_service = ResumeService(resume_repository, user_repository)
+
+    results = await resume_service.upload_resumes_batch(resumes, operator)
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    return JSONResponse(
+        content={"results": results, "succeeded": succeeded, "failed": len(results) - succeeded},
+        status_code=200,
+    )
+
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(require_read_access)])
+async def get_parse_job(job_id: str):
+    job = await parse_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(content=job.to_dict(), status_code=200)
     
 
 # @router.get("/resume/{resume_id}")
@@ -61,62 +120,181 @@ async def upload_resume(resume: UploadFile = File(...), db_session: Session = De
 
 #     return await resume_service.get_resume_with_positions_and_skills(resume_id, db_session)
 
-@router.get("/resume/{resume_id}")
+@router.get("/resume/{resume_id}", dependencies=[Depends(require_read_access)])
 async def get_resume_with_positions_and_skills(
     resume_id: str,
     request: Request,
     include_pdf: bool = Query(False, description="If true, includes base64 PDF in JSON"),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
-    resume_repository = ResumeRepository(db_session)
-    user_repository = UserRepository()
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
     resume_service = ResumeService(resume_repository, user_repository)
 
-    data = await resume_service.get_resume_with_positions_and_skills(resume_id, include_pdf=include_pdf)
+    data = await resume_service.get_resume_detail(resume_id)
+    # The ETag covers the assembled detail, so a revalidation is answered before any serialization or PDF read
+    cache_headers = {"ETag": content_etag(data, include_pdf), "Cache-Control": ResumeConfig.DETAIL_CACHE_CONTROL}
+    if is_not_modified(request, cache_headers["ETag"]):
+        return not_modified_response(cache_headers)
+
     # Always include a direct URL so the frontend can stream/display the PDF efficiently
     data["pdf_url"] = str(request.url_for("get_resume_pdf", resume_id=resume_id))
-    return JSONResponse(content=jsonable_encoder(data), status_code=200)
+    if include_pdf:
+        # The base64 PDF is encoded while it is sent, so memory stays flat whatever the file size
+        return StreamingResponse(
+            resume_service.stream_detail_with_pdf(jsonable_encoder(data)),
+            media_type="application/json",
+            headers=cache_headers,
+        )
+    return JSONResponse(content=jsonable_encoder(data), status_code=200, headers=cache_headers)
+
+class ResumeDetailsRequest(BaseModel):
+    resume_ids: List[str] = Field(..., min_length=1, max_length=ResumeConfig.DETAILS_MAX_IDS)
+
+
+@router.post("/details", dependencies=[Depends(require_read_access)])
+async def get_resume_details(
+    body: ResumeDetailsRequest,
+    request: Request,
+    db_session: AsyncSession = Depends(get_db),
+):
+    """Details of many resumes in one call (e.g. a whole list page), keyed by the requested ids"""
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
+    resume_service = ResumeService(resume_repository, user_repository)
+
+    details, missing = await resume_service.get_resume_details(body.resume_ids)
+    for resume_id, data in details.items():
+        data["pdf_url"] = str(request.url_for("get_resume_pdf", resume_id=resume_id))
+    return JSONResponse(content=jsonable_encoder({"data": details, "missing": missing}), status_code=200)
 
-@router.get("/resume/{resume_id}/pdf", name="get_resume_pdf")
+@router.get("/resume/{resume_id}/pdf", name="get_resume_pdf", dependencies=[Depends(require_read_access)])
 async def get_resume_pdf(
     resume_id: str,
-    db_session: Session = Depends(get_db),
+    request: Request,
+    db_session: AsyncSession = Depends(get_db),
 ):
-    resume_repository = ResumeRepository(db_session)
-    user_repository = UserRepository()
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
     resume_service = ResumeService(resume_repository, user_repository)
 
-    pdf_path = await resume_service.get_resume_pdf_path(resume_id)
+    pdf_path, content_hash = await resume_service.get_resume_pdf(resume_id)
     if not os.path.exists(pdf_path):
         raise HTTPException(status_code=404, detail="PDF file not found on disk")
 
+    cache_headers = {"ETag": file_etag(pdf_path, content_hash), "Cache-Control": ResumeConfig.PDF_CACHE_CONTROL}
+    if is_not_modified(request, cache_headers["ETag"]):
+        return not_modified_response(cache_headers)
+
+    # FileResponse answers Range requests (206, multipart for several ranges) and honours If-Range
+    # against the ETag above, so viewers can fetch the pages they display
     return FileResponse(
         pdf_path,
         media_type="application/pdf",
         filename=os.path.basename(pdf_path),
+        headers=cache_headers,
     )
 
 
-@router.get("/list")
+@router.get("/list", dependencies=[Depends(require_read_access)])
 async def list_resumes(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db_session: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; takes precedence over page"),
+    db_session: AsyncSession = Depends(get_db)
+):
+    """Paginated query for resumes (page/page_size, or keyset pagination via cursor)"""
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
+    resume_service = ResumeService(resume_repository, user_repository)
+
+    resumes, next_cursor = await resume_service.get_all_resumes_paginated(page, page_size, cursor)
+    return JSONResponse(content={"data": resumes, "page": page, "page_size": page_size, "next_cursor": next_cursor})
+
+
+
+@router.get("/export")
+async def export_resumes(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    operator: Optional[str] = Query(None),
+    created_from: Optional[str] = Query(None, description="ISO date/time, inclusive"),
+    created_to: Optional[str] = Query(None, description="ISO date/time, inclusive; a bare date covers the whole day"),
+    current_user: str = Depends(get_current_user_username),
+):
+    """Every matching resume with its positions and skills, streamed as NDJSON or CSV"""
+    resume_service = ResumeService(None, AsyncUserRepository())
+
+    # The stream opens its own session; nothing is read until the body is being sent
+    body = resume_service.export_resumes(format, operator=operator, created_from=created_from, created_to=created_to)
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv; charset=utf-8"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="resumes.{format}"'},
+    )
+
+
+@router.get("/search", dependencies=[Depends(require_read_access)])
+async def search_resumes(
+    q: str = Query("", description="Search terms; all must match. A trailing * makes a term a prefix. "
+                                    "May be empty when operator or a date filter is given"),
+    operator: Optional[str] = Query(None),
+    area: Optional[str] = Query(None),
+    skill: Optional[str] = Query(None),
+    created_from: Optional[str] = Query(None, description="ISO date/time, inclusive"),
+    created_to: Optional[str] = Query(None, description="ISO date/time, inclusive; a bare date covers the whole day"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    db_session: AsyncSession = Depends(get_db),
 ):
-    """Paginated query for resumes"""
-    resume_repository = ResumeRepository(db_session)
-    user_repository = UserRepository()
+    """Ranked full-text search over names, skills, areas, work experience and education"""
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
     resume_service = ResumeService(resume_repository, user_repository)
 
-    resumes = await resume_service.get_all_resumes_paginated(page, page_size)
-    return JSONResponse(content={"data": resumes, "page": page, "page_size": page_size})
+    result = await resume_service.search_resumes(
+        q, page, page_size,
+        operator=operator, area=area, skill=skill, created_from=created_from, created_to=created_to,
+    )
+    return JSONResponse(content=result, status_code=200)
+
+
+@router.get("/filter", dependencies=[Depends(require_read_access)])
+async def filter_resumes(
+    q: str = Query(..., description='Boolean skill/area expression, e.g. python AND (sql OR area:"new york") AND NOT java'),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(100, ge=1, le=1000),
+    db_session: AsyncSession = Depends(get_db),
+):
+    """Resume ids matching a boolean expression over canonical skills and areas"""
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
+    resume_service = ResumeService(resume_repository, user_repository)
+
+    result = await resume_service.filter_resumes(q, page, page_size)
+    return JSONResponse(content=result, status_code=200)
+
+
+class RankResumesRequest(BaseModel):
+    job_description: str
+    top_k: int = Field(20, ge=1, le=500)
+
+
+@router.post("/rank", dependencies=[Depends(require_read_access)])
+async def rank_resumes(body: RankResumesRequest, db_session: AsyncSession = Depends(get_db)):
+    """Top-k stored resumes for a job description (BM25 over extracted text and skills)"""
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
+    resume_service = ResumeService(resume_repository, user_repository)
 
+    ranked = await resume_service.rank_resumes(body.job_description, body.top_k)
+    return JSONResponse(content={"data": ranked, "top_k": body.top_k}, status_code=200)
 
 
 @router.delete("/remove/{resume_id}")
-async def remove_resume(resume_id: str, db_session: Session = Depends(get_db)):
-    resume_repository = ResumeRepository(db_session)
-    user_repository = UserRepository()
+async def remove_resume(resume_id: str, db_session: AsyncSession = Depends(get_db)):
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
     resume_service = ResumeService(resume_repository, user_repository)
 
     success = await resume_service.remove_resume(resume_id, db_session)
@@ -146,10 +324,10 @@ class UpdateResumeRequest(BaseModel):
 async def update_resume(
     resume_id: str,
     body: UpdateResumeRequest,
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
-    resume_repository = ResumeRepository(db_session)
-    user_repository = UserRepository()
+    resume_repository = AsyncResumeRepository(db_session)
+    user_repository = AsyncUserRepository()
     resume_service = ResumeService(resume_repository, user_repository)
 
     updated = await resume_service.update_resume_full(
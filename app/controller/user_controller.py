@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.config.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config.database import AsyncSessionLocal
 from app.service.user_service import UserService
 from app.model.dto import UserRegisterDTO, UserLoginDTO
 from app.model.vo import UserVO
@@ -8,18 +8,15 @@ from app.model.vo import UserVO
 router = APIRouter(prefix="/user", tags=["User"])
 service = UserService()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 @router.post("/register", response_model=UserVO)
-def register_user(dto: UserRegisterDTO, db: Session = Depends(get_db)):
-    user = service.register_user(db, dto)
+async def register_user(dto: UserRegisterDTO, db: AsyncSession = Depends(get_db)):
+    user = await service.register_user(db, dto)
     return user
 
 @router.post("/login")
-def login_user(dto: UserLoginDTO, db: Session = Depends(get_db)):
-    return service.login_user(db, dto)
+async def login_user(dto: UserLoginDTO, db: AsyncSession = Depends(get_db)):
+    return await service.login_user(db, dto)
@@ -1,12 +1,46 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.controller import user_controller
 from app.controller import resume_controller
+from app.config.resume_config import ResumeConfig
+from app.config.logging_config import configure_logging
+from app.service.resume_service import process_parse_job
+from app.utils.parse_jobs import parse_jobs
+from app.utils.parse_pool import start_parse_pool_warmup, is_parse_pool_ready, shutdown_parse_pool
+from app.utils.upload_limits import UploadSizeLimitMiddleware
+from app.utils.bitmap_index import skill_bitmap_index
+from app.utils.metrics import registry
+from app.utils.request_metrics import MetricsMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Resume Management System")
+logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Non-blocking: the API serves requests while parse workers load the spaCy model
+    if ResumeConfig.SPACY_WARMUP:
+        start_parse_pool_warmup()
+    # Background parse jobs interrupted by a restart of a worker on this host
+    try:
+        await parse_jobs.recover(process_parse_job)
+    except Exception as e:
+        logger.error(f"Could not recover unfinished parse jobs: {e}")
+    yield
+    shutdown_parse_pool()
+    if skill_bitmap_index.loaded:
+        skill_bitmap_index.save()
 
+
+configure_logging()
+
+app = FastAPI(title="Resume Management System", lifespan=lifespan)
+
+
+# Added before CORS so CORS stays outermost and 413 replies still carry CORS headers
+app.add_middleware(UploadSizeLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -20,6 +54,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so it is outermost and times everything, including 413s and CORS preflights
+app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(user_controller.router)
@@ -28,3 +64,17 @@ app.include_router(resume_controller.router)
 @app.get("/")
 def root():
     return {"message": "Resume Management System API is running"}
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 503 until the parse workers have loaded the spaCy model."""
+    model_loaded = is_parse_pool_ready()
+    return JSONResponse(
+        content={"ready": model_loaded, "model_loaded": model_loaded},
+        status_code=200 if model_loaded else 503,
+    )
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint. Metrics are per API worker process."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,11 +1,25 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, func, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, Text, func, ForeignKey, Index
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.config.database import Base
 
+# SQLite keeps DATETIME as text and server_default=func.now() writes "YYYY-MM-DD HH:MM:SS".
+# Bound datetimes must use the same format, or "... 10:00:00.000000" sorts after the stored
+# "... 10:00:00" and `gmt_create < cursor` matches the cursor's own row.
+Timestamp = DateTime().with_variant(
+    SQLITE_DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
 class ResumeDetail(Base):
     __tablename__ = "resume_detail"
+    __table_args__ = (
+        # Serves the newest-first resume list and its keyset (cursor) pagination
+        Index("ix_resume_detail_gmt_create_resume_id", "gmt_create", "resume_id"),
+    )
 
     resume_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100))
@@ -17,11 +31,17 @@ class ResumeDetail(Base):
     resume_url = Column(String(255))
     operator = Column(String(100))
     user_id = Column(String(36), ForeignKey("user.user_id"))
+    content_hash = Column(String(64), index=True)  # SHA-256 of the uploaded PDF, used to skip duplicate uploads
+
+    gmt_create = Column(Timestamp, server_default=func.now())
+    gmt_modify = Column(Timestamp, server_default=func.now(), onupdate=func.now())
 
-    gmt_create = Column(DateTime, server_default=func.now())
-    gmt_modify = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Read-side only (children are written and deleted explicitly by ResumeRepository); lets
+    # the detail view load a resume with its positions and skills in one joined query
+    positions = relationship("Position", viewonly=True, lazy="select")
+    skills = relationship("Skill", viewonly=True, lazy="select")
 
-    def __init__(self, name, phone_number, birthday, working_exp, education, area, resume_url, operator, user_id):
+    def __init__(self, name, phone_number, birthday, working_exp, education, area, resume_url, operator, user_id, content_hash=None):
         self.name = name
         self.phone_number = phone_number
         self.birthday = birthday
@@ -31,6 +51,7 @@ class ResumeDetail(Base):
         self.resume_url = resume_url
         self.operator = operator
         self.user_id = user_id
+        self.content_hash = content_hash
 
 class Position(Base):
     __tablename__ = "position"
@@ -61,3 +82,36 @@ class Skill(Base):
         self.skill_name = skill_name
         self.name = name
         self.birthday = birthday
+
+class ResumeText(Base):
+    """Raw text extracted from a resume's PDF, so fields can be re-extracted without decoding it again."""
+    __tablename__ = "resume_text"
+
+    resume_id = Column(UUID(as_uuid=True), ForeignKey("resume_detail.resume_id"), primary_key=True)
+    text = Column(Text().with_variant(MEDIUMTEXT(), "mysql"))  # TEXT caps at 64 KB on MySQL
+    parser_version = Column(Integer, nullable=False, index=True)  # pdf_utils.PARSER_VERSION that produced the fields
+
+    gmt_modify = Column(Timestamp, server_default=func.now(), onupdate=func.now())
+
+    def __init__(self, resume_id, text, parser_version):
+        self.resume_id = resume_id
+        self.text = text
+        self.parser_version = parser_version
+
+class ParseJobRecord(Base):
+    """A background parse job (POST /resume/upload?async_parse=true), shared by all API workers."""
+    __tablename__ = "parse_job"
+
+    job_id = Column(String(36), primary_key=True)
+    filename = Column(String(255))
+    file_path = Column(String(255))
+    operator = Column(String(100))
+    content_hash = Column(String(64))
+    status = Column(String(16), nullable=False, index=True)  # queued -> running -> done | failed
+    owner = Column(String(255))  # "host:pid" of the API worker running the job
+    resume_id = Column(String(36))
+    error = Column(Text)
+
+    created_at = Column(Timestamp, nullable=False)
+    started_at = Column(Timestamp)
+    finished_at = Column(Timestamp)
@@ -0,0 +1,49 @@
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.model.resume import ParseJobRecord
+
+UNFINISHED = ("queued", "running")
+
+
+class AsyncParseJobRepository:
+    async def insert(self, db: AsyncSession, fields: dict):
+        db.add(ParseJobRecord(**fields))
+        await db.commit()
+
+    async def update(self, db: AsyncSession, job_id: str, fields: dict):
+        await db.execute(update(ParseJobRecord).where(ParseJobRecord.job_id == job_id).values(**fields))
+        await db.commit()
+
+    async def get(self, db: AsyncSession, job_id: str):
+        result = await db.execute(select(ParseJobRecord).where(ParseJobRecord.job_id == job_id))
+        return result.scalars().first()
+
+    async def get_unfinished_on_host(self, db: AsyncSession, host: str):
+        result = await db.execute(
+            select(ParseJobRecord)
+            .where(ParseJobRecord.status.in_(UNFINISHED), ParseJobRecord.owner.like(f"{host}:%"))
+            .order_by(ParseJobRecord.created_at)
+        )
+        return result.scalars().all()
+
+    async def claim(self, db: AsyncSession, job_id: str, old_owner: str, new_owner: str) -> bool:
+        """Take over an unfinished job; False if another worker claimed it first."""
+        result = await db.execute(
+            update(ParseJobRecord)
+            .where(
+                ParseJobRecord.job_id == job_id,
+                ParseJobRecord.owner == old_owner,
+                ParseJobRecord.status.in_(UNFINISHED),
+            )
+            .values(owner=new_owner, status="queued", started_at=None)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+    async def delete_finished_before(self, db: AsyncSession, before):
+        await db.execute(
+            delete(ParseJobRecord).where(
+                ParseJobRecord.status.in_(("done", "failed")), ParseJobRecord.finished_at < before
+            )
+        )
+        await db.commit()
@@ -0,0 +1,128 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repository.resume_repository import ResumeRepository, apply_index_updates
+
+# Fields of one exported resume, in output (CSV column) order
+EXPORT_FIELDS = (
+    "resume_id", "name", "phone_number", "birthday", "working_exp", "education", "area",
+    "resume_url", "operator", "user_id", "gmt_create", "gmt_modify", "positions", "skills",
+)
+
+
+class AsyncResumeRepository:
+    """
+    Async facade over ResumeRepository for the request path.
+
+    Each call runs the synchronous repository method through AsyncSession.run_sync: the ORM
+    code is the same, but every database round-trip is awaited on the async driver, so the
+    event loop serves other requests while a query is in flight. run_sync still runs the
+    method's Python code on the event loop, so index maintenance (blocking SQLite FTS5
+    writes, ranker and bitmap updates) is deferred and applied in the threadpool after it.
+    """
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def _run(self, method, *args, **kwargs):
+        repository = None
+
+        def call(sync_session):
+            nonlocal repository
+            repository = ResumeRepository(sync_session, defer_indexing=True)
+            return method(repository, *args, **kwargs)
+
+        result = await self.db_session.run_sync(call)
+        if repository.index_updates:
+            await run_in_threadpool(apply_index_updates, repository.index_updates)
+        return result
+
+    async def save_resume_detail(self, *args, **kwargs):
+        return await self._run(ResumeRepository.save_resume_detail, *args, **kwargs)
+
+    async def get_resume_by_content_hash(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_resume_by_content_hash, *args, **kwargs)
+
+    async def link_duplicate_resume(self, *args, **kwargs):
+        return await self._run(ResumeRepository.link_duplicate_resume, *args, **kwargs)
+
+    async def count_resumes_by_url(self, *args, **kwargs):
+        return await self._run(ResumeRepository.count_resumes_by_url, *args, **kwargs)
+
+    async def save_position(self, *args, **kwargs):
+        return await self._run(ResumeRepository.save_position, *args, **kwargs)
+
+    async def save_skill(self, *args, **kwargs):
+        return await self._run(ResumeRepository.save_skill, *args, **kwargs)
+
+    async def save_parsed_resumes(self, *args, **kwargs):
+        return await self._run(ResumeRepository.save_parsed_resumes, *args, **kwargs)
+
+    async def get_resume_detail_with_position_and_skill(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_resume_detail_with_position_and_skill, *args, **kwargs)
+
+    async def get_resume_details(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_resume_details, *args, **kwargs)
+
+    async def get_resume_file_path(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_resume_file_path, *args, **kwargs)
+
+    async def get_paginated_resumes(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_paginated_resumes, *args, **kwargs)
+
+    async def get_resumes_after_cursor(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_resumes_after_cursor, *args, **kwargs)
+
+    async def delete_resume_tree(self, *args, **kwargs):
+        return await self._run(ResumeRepository.delete_resume_tree, *args, **kwargs)
+
+    async def update_resume_full(self, *args, **kwargs):
+        return await self._run(ResumeRepository.update_resume_full, *args, **kwargs)
+
+    async def index_resume(self, *args, **kwargs):
+        return await self._run(ResumeRepository.index_resume, *args, **kwargs)
+
+    async def get_resumes_by_operator(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_resumes_by_operator, *args, **kwargs)
+
+    async def get_resumes_by_user(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_resumes_by_user, *args, **kwargs)
+
+    async def get_resume_by_id(self, *args, **kwargs):
+        return await self._run(ResumeRepository.get_resume_by_id, *args, **kwargs)
+
+    async def stream_export(self, batch_size: int = 1000, **filters):
+        """
+        Yield every resume matching `filters` (see ResumeRepository.export_statement) as a dict
+        with its positions and skills. Rows are read through a server-side cursor, batch_size
+        at a time, so memory stays flat however many resumes match.
+        """
+        statement = ResumeRepository.export_statement(**filters).execution_options(yield_per=batch_size)
+        result = await self.db_session.stream(statement)
+        record = None
+        async for row in result:
+            if record is None or record["resume_id"] != str(row.resume_id):
+                if record is not None:
+                    yield record
+                record = {
+                    "resume_id": str(row.resume_id),
+                    "name": row.name,
+                    "phone_number": row.phone_number,
+                    "birthday": row.birthday,
+                    "working_exp": row.working_exp,
+                    "education": row.education,
+                    "area": row.area,
+                    "resume_url": row.resume_url,
+                    "operator": row.operator,
+                    "user_id": row.user_id,
+                    "gmt_create": row.gmt_create.isoformat() if row.gmt_create else None,
+                    "gmt_modify": row.gmt_modify.isoformat() if row.gmt_modify else None,
+                    "positions": [],
+                    "skills": [],
+                }
+            # The joins repeat the position for every skill (and vice versa)
+            if row.position_name is not None and row.position_name not in record["positions"]:
+                record["positions"].append(row.position_name)
+            if row.skill_name is not None and row.skill_name not in record["skills"]:
+                record["skills"].append(row.skill_name)
+        if record is not None:
+            yield record
@@ -0,0 +1,18 @@
+from app.model.entities import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+class AsyncUserRepository:
+    async def get_by_email(self, db: AsyncSession, email: str):
+        result = await db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    async def get_by_username(self, db: AsyncSession, username: str):
+        result = await db.execute(select(User).where(User.username == username))
+        return result.scalars().first()
+
+    async def create_user(self, db: AsyncSession, user: User):
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
@@ -1,10 +1,18 @@
 from fastapi import HTTPException  # Ensure the import is here
 from datetime import datetime,date
-from app.model.resume import ResumeDetail, Position, Skill
-from sqlalchemy.orm import sessionmaker
+from app.model.resume import ResumeDetail, Position, Skill, ResumeText
+from sqlalchemy import and_, bindparam, func, insert, or_, select, update
+from sqlalchemy.orm import joinedload, selectinload, sessionmaker
 import json
 import uuid
 from sqlalchemy.exc import SQLAlchemyError
+from app.utils.search_index import search_index
+from app.utils.ranking import resume_ranker
+from app.utils.bitmap_index import skill_bitmap_index
+from app.utils.detail_cache import resume_detail_cache
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Helper function to parse birthday strings
 def _parse_birthday(birthday_str):
@@ -27,6 +35,79 @@ def _parse_birthday(birthday_str):
     
 
 
+def _search_document(resume, skill_names, text=None):
+    # `text` (the stored extracted text, when there is one) feeds the ranker; the other indexes ignore it
+    return {
+        "resume_id": str(resume.resume_id),
+        "name": resume.name,
+        "skills": skill_names,
+        "area": resume.area,
+        "working_exp": resume.working_exp,
+        "education": resume.education,
+        "operator": resume.operator,
+        "gmt_create": _to_iso(resume.gmt_create),
+        "gmt_modify": _to_iso(resume.gmt_modify),
+        "text": text,
+    }
+
+
+def _index_document(doc):
+    # Search/rank indexes are derived data: never fail a database write because of them
+    for index in (search_index, resume_ranker, skill_bitmap_index):
+        try:
+            index.upsert(doc)
+        except Exception as e:
+            logger.warning(f"{type(index).__name__} update failed: {e}")
+
+
+def _unindex_resume(resume_id):
+    for index in (search_index, resume_ranker, skill_bitmap_index):
+        try:
+            index.remove(resume_id)
+        except Exception as e:
+            logger.warning(f"{type(index).__name__} update failed: {e}")
+
+
+def apply_index_updates(updates):
+    """Apply the index updates a ResumeRepository(defer_indexing=True) collected; blocking."""
+    for op, arg in updates:
+        if op == "upsert":
+            _index_document(arg)
+        else:
+            _unindex_resume(arg)
+
+
+def _parsed_fields(resume_data):
+    # resume_detail columns from scan_pdf output, normalized the way save_resume_detail stores them
+    birthday_date = _parse_birthday(resume_data["birthday"])
+    return {
+        "name": resume_data["name"],
+        "phone_number": resume_data["phone_number"],
+        "birthday": str(birthday_date) if birthday_date else None,
+        "working_exp": resume_data["working_exp"],
+        "education": json.dumps(resume_data["education"]),
+        "area": resume_data["area"],
+    }
+
+
+def _skill_rows(resume_id, resume_data, fields):
+    # A resume without skills still gets one empty skill row, as save_skill did
+    return [
+        {
+            "skill_id": uuid.uuid4(),
+            "resume_id": resume_id,
+            "skill_name": skill_name,
+            "name": fields["name"],
+            "birthday": fields["birthday"],
+        }
+        for skill_name in dict.fromkeys(resume_data.get("skills") or [None])
+    ]
+
+
+def _text_row(resume_id, resume_data):
+    return {"resume_id": resume_id, "text": resume_data["text"], "parser_version": resume_data["parser_version"]}
+
+
 def _to_iso(dt):
     if isinstance(dt, datetime):
         return dt.isoformat()
@@ -34,17 +115,61 @@ def _to_iso(dt):
         return dt.isoformat()
     return dt
 
+
+def _detail_dict(resume_detail):
+    # The detail payload shared by the single and batch detail endpoints
+    return {
+        "resume_detail": {
+            "resume_id": str(resume_detail.resume_id),
+            "name": resume_detail.name,
+            "phone_number": resume_detail.phone_number,
+            "birthday": resume_detail.birthday,
+            "working_exp": resume_detail.working_exp,
+            "education": resume_detail.education,
+            "area": resume_detail.area,
+            "resume_url": resume_detail.resume_url,
+            "operator": resume_detail.operator,
+            "user_id": resume_detail.user_id,
+            "content_hash": resume_detail.content_hash,
+            "gmt_modify": _to_iso(resume_detail.gmt_modify),
+        },
+        "positions": [
+            {"position_id": str(p.position_id), "position_name": p.position_name}
+            for p in resume_detail.positions
+        ],
+        "skills": [
+            {"skill_id": str(s.skill_id), "skill_name": s.skill_name}
+            for s in resume_detail.skills
+        ],
+    }
+
+
 class ResumeRepository:
 
-    def __init__(self, db_session):
+    def __init__(self, db_session, defer_indexing: bool = False):
         self.db_session = db_session
+        # Index writes (SQLite FTS5, ranker, bitmaps) block; with defer_indexing they are
+        # collected here for the caller to apply off the event loop (see AsyncResumeRepository)
+        self.index_updates = [] if defer_indexing else None
+
+    def _index(self, doc):
+        if self.index_updates is None:
+            _index_document(doc)
+        else:
+            self.index_updates.append(("upsert", doc))
+
+    def _unindex(self, resume_id):
+        if self.index_updates is None:
+            _unindex_resume(resume_id)
+        else:
+            self.index_updates.append(("remove", resume_id))
 
     
 #-----------------------------------------------------------------------------------------------
 #---------------save_resume_detail--------------------------------------------------------------
 #-----------------------------------------------------------------------------------------------
 
-    def save_resume_detail(self, name, phone_number, birthday, working_exp, education, area, resume_url, operator, user_id):
+    def save_resume_detail(self, name, phone_number, birthday, working_exp, education, area, resume_url, operator, user_id, content_hash=None):
         try:
         # Convert birthday string to date
             birthday_date = _parse_birthday(birthday)
@@ -62,7 +187,8 @@ class ResumeRepository:
                 area=area,
                 resume_url=resume_url,
                 operator=operator,
-                user_id=user_id
+                user_id=user_id,
+                content_hash=content_hash
             )
             
             self.db_session.add(new_resume)
@@ -75,6 +201,75 @@ class ResumeRepository:
             raise HTTPException(status_code=500, detail=f"Error saving resume: {e}")
         
 
+#-----------------------------------------------------------------------------------------------
+#---------------duplicate uploads---------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    def get_resume_by_content_hash(self, content_hash):
+        # Oldest record with this file hash (linked duplicates share it)
+        if not content_hash:
+            return None
+        return (
+            self.db_session.query(ResumeDetail)
+            .filter_by(content_hash=content_hash)
+            .order_by(ResumeDetail.gmt_create)
+            .first()
+        )
+
+    def link_duplicate_resume(self, existing: ResumeDetail, operator):
+        """Copy an existing resume (detail, positions, skills) into a new record that shares its file."""
+        try:
+            new_resume = ResumeDetail(
+                name=existing.name,
+                phone_number=existing.phone_number,
+                birthday=existing.birthday,
+                working_exp=existing.working_exp,
+                education=existing.education,
+                area=existing.area,
+                resume_url=existing.resume_url,
+                operator=operator,
+                user_id=existing.user_id,
+                content_hash=existing.content_hash
+            )
+            self.db_session.add(new_resume)
+            self.db_session.flush()
+
+            for p in self.db_session.query(Position).filter_by(resume_id=existing.resume_id).all():
+                self.db_session.add(Position(
+                    resume_id=new_resume.resume_id,
+                    name=p.name,
+                    birthday=p.birthday,
+                    position_name=p.position_name
+                ))
+            for sk in self.db_session.query(Skill).filter_by(resume_id=existing.resume_id).all():
+                self.db_session.add(Skill(
+                    resume_id=new_resume.resume_id,
+                    skill_name=sk.skill_name,
+                    name=sk.name,
+                    birthday=sk.birthday
+                ))
+            resume_text = self.db_session.get(ResumeText, existing.resume_id)
+            if resume_text:
+                self.db_session.add(ResumeText(
+                    resume_id=new_resume.resume_id,
+                    text=resume_text.text,
+                    parser_version=resume_text.parser_version
+                ))
+
+            self.db_session.commit()
+            self.db_session.refresh(new_resume)
+            self.index_resume(new_resume.resume_id)
+            return new_resume
+
+        except Exception as e:
+            self.db_session.rollback()
+            raise HTTPException(status_code=500, detail=f"Error linking duplicate resume: {e}")
+
+    def count_resumes_by_url(self, resume_url):
+        # Number of records still pointing at a stored file
+        return self.db_session.query(ResumeDetail).filter_by(resume_url=resume_url).count()
+
+
 #-----------------------------------------------------------------------------------------------
 #---------------save_position--------------------------------------------------------------------
 #-----------------------------------------------------------------------------------------------
@@ -106,7 +301,139 @@ class ResumeRepository:
         self.db_session.add(new_skill)
         self.db_session.commit()
         return new_skill
-    
+
+#-----------------------------------------------------------------------------------------------
+#---------------save_parsed_resumes--------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    def save_parsed_resumes(self, records: list[dict]):
+        """
+        Persist many parsed resumes (detail, position, skills and extracted text) in one transaction.
+
+        Each record has resume_data (scan_pdf output), resume_url, operator and optionally
+        content_hash. Rows go in as one multi-row INSERT per table (split into pages by the
+        driver), so the cost is a handful of statements and a single commit whatever the
+        number of resumes or skills; either every resume is stored or none is.
+        Returns the stored ResumeDetail objects in record order.
+        """
+        if not records:
+            return []
+
+        detail_rows, position_rows, skill_rows, text_rows, skills_by_id, texts_by_id = [], [], [], [], {}, {}
+        for record in records:
+            resume_data = record["resume_data"]
+            resume_id = uuid.uuid4()
+            fields = _parsed_fields(resume_data)
+            detail_rows.append({
+                "resume_id": resume_id,
+                **fields,
+                "resume_url": record["resume_url"],
+                "operator": record["operator"],
+                "user_id": "null",
+                "content_hash": record.get("content_hash"),
+            })
+            position_rows.append({
+                "position_id": uuid.uuid4(),
+                "resume_id": resume_id,
+                "name": fields["name"],
+                "birthday": fields["birthday"],
+                "position_name": None,
+            })
+            skill_rows.extend(_skill_rows(resume_id, resume_data, fields))
+            skills_by_id[resume_id] = [s for s in resume_data.get("skills") or [] if s]
+            texts_by_id[resume_id] = resume_data.get("text")
+            if resume_data.get("text") is not None:
+                text_rows.append(_text_row(resume_id, resume_data))
+
+        try:
+            self.db_session.execute(insert(ResumeDetail.__table__), detail_rows)
+            self.db_session.execute(insert(Position.__table__), position_rows)
+            self.db_session.execute(insert(Skill.__table__), skill_rows)
+            if text_rows:
+                self.db_session.execute(insert(ResumeText.__table__), text_rows)
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            raise HTTPException(status_code=500, detail=f"Error saving resumes: {e}")
+
+        return self._reindex_stored([row["resume_id"] for row in detail_rows], skills_by_id, texts_by_id)
+
+    def _reindex_stored(self, ids, skills_by_id, texts_by_id):
+        # Read the details back for their server-side timestamps (one IN query) and index them
+        stored = {
+            r.resume_id: r
+            for r in self.db_session.query(ResumeDetail).filter(ResumeDetail.resume_id.in_(ids))
+        }
+        resumes = [stored[resume_id] for resume_id in ids if resume_id in stored]
+        for resume in resumes:
+            self._index(_search_document(resume, skills_by_id[resume.resume_id], texts_by_id.get(resume.resume_id)))
+        return resumes
+
+
+#-----------------------------------------------------------------------------------------------
+#---------------re-extraction--------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    def get_reextract_batch(self, after_resume_id=None, limit: int = 200, stale_before: int | None = None):
+        """
+        Next `limit` resumes by resume_id after `after_resume_id`, as (resume_id, resume_url,
+        text) rows; text is None when it was never stored. With `stale_before`, only resumes
+        whose fields come from an older parser version (or an unknown one) are returned.
+        """
+        query = (
+            self.db_session.query(ResumeDetail.resume_id, ResumeDetail.resume_url, ResumeText.text)
+            .outerjoin(ResumeText, ResumeText.resume_id == ResumeDetail.resume_id)
+        )
+        if after_resume_id is not None:
+            query = query.filter(ResumeDetail.resume_id > after_resume_id)
+        if stale_before is not None:
+            query = query.filter(or_(ResumeText.parser_version.is_(None), ResumeText.parser_version < stale_before))
+        return query.order_by(ResumeDetail.resume_id).limit(limit).all()
+
+    def apply_reextracted_fields(self, results: list[tuple]):
+        """
+        Overwrite the extracted fields of stored resumes in one transaction. `results` are
+        (resume_id, resume_data) pairs from pdf_utils.reextract_fields; the detail, position
+        and skills are rewritten and the text row is replaced with the new parser version.
+        """
+        if not results:
+            return []
+
+        ids = [resume_id for resume_id, _ in results]
+        detail_rows, position_rows, skill_rows, text_rows, skills_by_id, texts_by_id = [], [], [], [], {}, {}
+        for resume_id, resume_data in results:
+            fields = _parsed_fields(resume_data)
+            detail_rows.append({"b_resume_id": resume_id, **fields})
+            position_rows.append({"b_resume_id": resume_id, "name": fields["name"], "birthday": fields["birthday"]})
+            skill_rows.extend(_skill_rows(resume_id, resume_data, fields))
+            skills_by_id[resume_id] = [s for s in resume_data.get("skills") or [] if s]
+            texts_by_id[resume_id] = resume_data["text"]
+            text_rows.append(_text_row(resume_id, resume_data))
+
+        detail_table, position_table = ResumeDetail.__table__, Position.__table__
+        try:
+            # Executemany UPDATEs keyed by resume_id; children are replaced wholesale
+            self.db_session.execute(
+                update(detail_table).where(detail_table.c.resume_id == bindparam("b_resume_id")),
+                detail_rows,
+            )
+            self.db_session.execute(
+                update(position_table).where(position_table.c.resume_id == bindparam("b_resume_id")),
+                position_rows,
+            )
+            self.db_session.query(Skill).filter(Skill.resume_id.in_(ids)).delete(synchronize_session=False)
+            self.db_session.execute(insert(Skill.__table__), skill_rows)
+            self.db_session.query(ResumeText).filter(ResumeText.resume_id.in_(ids)).delete(synchronize_session=False)
+            self.db_session.execute(insert(ResumeText.__table__), text_rows)
+            self.db_session.commit()
+        except Exception:
+            self.db_session.rollback()
+            raise
+
+        for resume_id in ids:
+            resume_detail_cache.invalidate(resume_id)
+        return self._reindex_stored(ids, skills_by_id, texts_by_id)
+
    
 #-----------------------------------------------------------------------------------------------
 #---------------get_resume_detail_with_position_and_skill--------------------------------------------------------------------
@@ -175,39 +502,33 @@ class ResumeRepository:
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid resume_id format")
 
+        # Positions come back joined to the detail row; skills are a second IN query, since
+        # joining both collections would return positions x skills rows
         resume_detail = (
             self.db_session.query(ResumeDetail)
+            .options(joinedload(ResumeDetail.positions), selectinload(ResumeDetail.skills))
             .filter_by(resume_id=resume_id)
             .first()
         )
         if not resume_detail:
             return None
+        return _detail_dict(resume_detail)
 
-        positions = self.db_session.query(Position).filter_by(resume_id=resume_id).all()
-        skills = self.db_session.query(Skill).filter_by(resume_id=resume_id).all()
+    def get_resume_details(self, resume_id_strs: list[str]) -> dict[str, dict]:
+        """Details of many resumes, keyed by canonical resume_id; ids that don't exist are left out."""
+        try:
+            resume_ids = [uuid.UUID(resume_id_str) for resume_id_str in resume_id_strs]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid resume_id format")
 
-        return {
-            "resume_detail": {
-                "resume_id": str(resume_detail.resume_id),
-                "name": resume_detail.name,
-                "phone_number": resume_detail.phone_number,
-                "birthday": resume_detail.birthday,
-                "working_exp": resume_detail.working_exp,
-                "education": resume_detail.education,
-                "area": resume_detail.area,
-                "resume_url": resume_detail.resume_url,
-                "operator": resume_detail.operator,
-                "user_id": resume_detail.user_id,
-            },
-            "positions": [
-                {"position_id": str(p.position_id), "position_name": p.position_name}
-                for p in positions
-            ],
-            "skills": [
-                {"skill_id": str(s.skill_id), "skill_name": s.skill_name}
-                for s in skills
-            ],
-        }
+        # Three queries however many ids: the details, then positions and skills with one IN (...) each
+        resume_details = (
+            self.db_session.query(ResumeDetail)
+            .options(selectinload(ResumeDetail.positions), selectinload(ResumeDetail.skills))
+            .filter(ResumeDetail.resume_id.in_(resume_ids))
+            .all()
+        )
+        return {str(resume_detail.resume_id): _detail_dict(resume_detail) for resume_detail in resume_details}
 
     def get_resume_file_path(self, resume_id_str: str) -> str | None:
         try:
@@ -228,20 +549,86 @@ class ResumeRepository:
 #-----------------------------------------------------------------------------------------------
     def get_paginated_resumes(self, offset: int, limit: int):
         query = (
+            self._resume_list_query()
+            .offset(offset)
+            .limit(limit)
+        )
+        return query.all()
+
+    def get_resumes_after_cursor(self, gmt_create, resume_id, position_id, limit: int):
+        # Keyset pagination: seek past the last row of the previous page using the
+        # (gmt_create, resume_id) index, so every page costs the same regardless of depth
+        query = (
+            self._resume_list_query()
+            .filter(
+                or_(
+                    ResumeDetail.gmt_create < gmt_create,
+                    and_(
+                        ResumeDetail.gmt_create == gmt_create,
+                        or_(
+                            ResumeDetail.resume_id < resume_id,
+                            and_(ResumeDetail.resume_id == resume_id, Position.position_id < position_id),
+                        ),
+                    ),
+                )
+            )
+            .limit(limit)
+        )
+        return query.all()
+
+    def _resume_list_query(self):
+        # Newest first; resume_id/position_id make the order total so pages never overlap
+        return (
             self.db_session.query(
                 ResumeDetail.resume_id,          # ← add this
                 ResumeDetail.name,
                 ResumeDetail.operator,
                 ResumeDetail.gmt_create,
                 ResumeDetail.gmt_modify,
+                Position.position_id,
                 Position.position_name
             )
             .join(Position, Position.resume_id == ResumeDetail.resume_id)
-            .order_by(ResumeDetail.gmt_create.desc())
-            .offset(offset)
-            .limit(limit)
+            .order_by(ResumeDetail.gmt_create.desc(), ResumeDetail.resume_id.desc(), Position.position_id.desc())
         )
-        return query.all()
+
+
+#-----------------------------------------------------------------------------------------------
+#---------------export--------------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def export_statement(operator=None, created_from=None, created_to=None):
+        # One row per (resume, position, skill), grouped by resume_id so a streaming reader can
+        # assemble each resume from consecutive rows; resume_id order walks the primary key
+        query = (
+            select(
+                ResumeDetail.resume_id,
+                ResumeDetail.name,
+                ResumeDetail.phone_number,
+                ResumeDetail.birthday,
+                ResumeDetail.working_exp,
+                ResumeDetail.education,
+                ResumeDetail.area,
+                ResumeDetail.resume_url,
+                ResumeDetail.operator,
+                ResumeDetail.user_id,
+                ResumeDetail.gmt_create,
+                ResumeDetail.gmt_modify,
+                Position.position_name,
+                Skill.skill_name,
+            )
+            .outerjoin(Position, Position.resume_id == ResumeDetail.resume_id)
+            .outerjoin(Skill, Skill.resume_id == ResumeDetail.resume_id)
+            .order_by(ResumeDetail.resume_id)
+        )
+        if operator:
+            query = query.where(ResumeDetail.operator == operator)
+        if created_from:
+            query = query.where(ResumeDetail.gmt_create >= created_from)
+        if created_to:
+            query = query.where(ResumeDetail.gmt_create <= created_to)
+        return query
 
       
 #-----------------------------------------------------------------------------------------------
@@ -267,10 +654,13 @@ class ResumeRepository:
             # Delete children first (no ON DELETE CASCADE defined in models)
             self.db_session.query(Skill).filter_by(resume_id=resume_uuid).delete(synchronize_session=False)
             self.db_session.query(Position).filter_by(resume_id=resume_uuid).delete(synchronize_session=False)
+            self.db_session.query(ResumeText).filter_by(resume_id=resume_uuid).delete(synchronize_session=False)
 
             # Delete parent
             self.db_session.delete(resume)
             self.db_session.commit()
+            resume_detail_cache.invalidate(resume_uuid)
+            self._unindex(str(resume_uuid))
             return resume  # return the object so service can remove the file
         except Exception as e:
             self.db_session.rollback()
@@ -338,13 +728,13 @@ class ResumeRepository:
                         resume.education = str(education)
                 if area is not None:
                     resume.area = area
-                if resume_url is not None:
+                if resume_url is not None and resume_url != resume.resume_url:
                     resume.resume_url = resume_url
+                    # The hash was of the old file; without it the PDF ETag falls back to size/mtime
+                    resume.content_hash = None
                 if operator is not None:
                     resume.operator = operator
 
-                resume.gmt_modify = datetime.utcnow()  # explicit touch
-
             # ------- Replace positions if provided -------
             if positions is not None:
                 # wipe and recreate (since no ON DELETE CASCADE & no unique constraints) :contentReference[oaicite:4]{index=4}
@@ -371,7 +761,13 @@ class ResumeRepository:
                     )
                     self.db_session.add(sk)
 
+            # Explicit touch, also when only positions or skills changed: other hosts' search
+            # indexes notice changes by gmt_modify
+            if detail_updates or positions is not None or skills is not None:
+                resume.gmt_modify = func.now()
+
             self.db_session.commit()
+            resume_detail_cache.invalidate(resume_uuid)
             self.db_session.refresh(resume)
 
             # Prepare payload (convert UUIDs for JSON)
@@ -386,7 +782,7 @@ class ResumeRepository:
                 .all()
             )
 
-            return {
+            payload = {
                 "resume_detail": {
                     "resume_id": str(resume.resume_id),
                     "name": resume.name,
@@ -422,6 +818,9 @@ class ResumeRepository:
                 ],
             }
 
+            self._index(_search_document(resume, [sk.skill_name for sk in updated_skills], self._stored_text(resume.resume_id)))
+            return payload
+
         except HTTPException:
             # pass through known HTTP errors
             raise
@@ -441,6 +840,70 @@ class ResumeRepository:
 
 
 
+#-----------------------------------------------------------------------------------------------
+#---------------search / rank indexes------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    def index_resume(self, resume_id):
+        # (Re)index one stored resume in the full-text search index and the ranker
+        resume = self.db_session.query(ResumeDetail).filter_by(resume_id=resume_id).first()
+        if not resume:
+            return
+        skills = self.db_session.query(Skill.skill_name).filter_by(resume_id=resume_id).all()
+        self._index(_search_document(resume, [s.skill_name for s in skills], self._stored_text(resume_id)))
+
+    def _stored_text(self, resume_id):
+        row = self.db_session.query(ResumeText.text).filter_by(resume_id=resume_id).first()
+        return row.text if row else None
+
+    def iter_search_documents(self, batch_size: int = 1000):
+        # Every resume as a search document, for (re)building the indexes; skills and texts are loaded per batch
+        offset = 0
+        while True:
+            resumes = (
+                self.db_session.query(ResumeDetail)
+                .order_by(ResumeDetail.resume_id)
+                .offset(offset)
+                .limit(batch_size)
+                .all()
+            )
+            if not resumes:
+                return
+            yield from self._search_documents(resumes)
+            offset += batch_size
+
+    def get_search_documents(self, resume_id_strs: list[str]) -> list[dict]:
+        """Search documents of the given resumes (ids that no longer exist are left out)."""
+        resume_ids = [uuid.UUID(resume_id_str) for resume_id_str in resume_id_strs]
+        resumes = self.db_session.query(ResumeDetail).filter(ResumeDetail.resume_id.in_(resume_ids)).all()
+        return list(self._search_documents(resumes))
+
+    def search_index_fingerprint(self):
+        """(number of resumes, latest gmt_modify): cheap to compare with ResumeSearchIndex.fingerprint()."""
+        count, last_modified = self.db_session.query(func.count(ResumeDetail.resume_id), func.max(ResumeDetail.gmt_modify)).one()
+        return count, _to_iso(last_modified)
+
+    def search_index_versions(self) -> dict[str, str | None]:
+        """{resume_id: gmt_modify} of every resume, to find what the search index is missing."""
+        return {
+            str(resume_id): _to_iso(gmt_modify)
+            for resume_id, gmt_modify in self.db_session.query(ResumeDetail.resume_id, ResumeDetail.gmt_modify)
+        }
+
+    def _search_documents(self, resumes):
+        resume_ids = [r.resume_id for r in resumes]
+        skills_by_resume = {}
+        for resume_id, skill_name in (
+            self.db_session.query(Skill.resume_id, Skill.skill_name).filter(Skill.resume_id.in_(resume_ids))
+        ):
+            skills_by_resume.setdefault(resume_id, []).append(skill_name)
+        texts = dict(
+            self.db_session.query(ResumeText.resume_id, ResumeText.text).filter(ResumeText.resume_id.in_(resume_ids))
+        )
+        for resume in resumes:
+            yield _search_document(resume, skills_by_resume.get(resume.resume_id, []), texts.get(resume.resume_id))
+
+
 #-----------------------------------------------------------------------------------------------
 
 
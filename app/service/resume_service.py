@@ -1,13 +1,35 @@
 from fastapi import HTTPException  # Ensure the import is here
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import math
+import uuid
 import os
+import zipfile
+from datetime import datetime
 from uuid import uuid4
-from app.utils.pdf_utils import scan_pdf
+from app.config.resume_config import ResumeConfig
+from app.utils.pdf_utils import scan_pdf, scan_pdfs
 from app.repository.resume_repository import ResumeRepository
-from app.repository.user_repository import UserRepository
+from app.repository.async_resume_repository import AsyncResumeRepository, EXPORT_FIELDS
+from app.repository.async_user_repository import AsyncUserRepository
+from app.config.database import AsyncSessionLocal, SessionLocal
+from app.utils.parse_pool import run_in_parse_pool
+from app.utils.parse_jobs import parse_jobs
+from app.utils.search_index import search_index
+from app.utils.ranking import resume_ranker
+from app.utils.bitmap_index import skill_bitmap_index
+from app.utils.detail_cache import resume_detail_cache
+from app.utils.metrics import observe_stage_timings, stage_duration
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 import logging
 import base64
 
+logger = logging.getLogger(__name__)
+
 class ResumeService:
     def __init__(self, resume_repository, user_repository):
         self.resume_repository = resume_repository
@@ -21,116 +43,371 @@ class ResumeService:
 
 
     async def upload_resume(self, file, operator, db_session):
-
-        logger = logging.getLogger(__name__)
-        logging.basicConfig(level=logging.DEBUG)
-
+        """Returns (resume_detail, duplicate); duplicates of a stored PDF are never re-parsed."""
+        file_path = None
         try:
-            # Define the upload directory
-            upload_dir = "resumes"
-            os.makedirs(upload_dir, exist_ok=True)
-
-            # Generate a unique filename
-            file_extension = file.filename.split('.')[-1]
-            unique_filename = f"{uuid4()}.{file_extension}"
-            file_path = os.path.join(upload_dir, unique_filename)
-
-
-            try:
-            # Save the file
-                with open(file_path, "wb") as buffer:
-                    buffer.write(await file.read())
-                    logger.info(f"File {file.filename} saved successfully to {file_path}.")
-            except Exception as e:
-                logger.error(f"Error saving file: {e}")
-                raise HTTPException(status_code=500, detail="Error saving the file.")
-            
-            try:
-            # Scan the PDF file to extract details
-                resume_data = scan_pdf(file_path)
-                logger.info("PDF scanned successfully.")
-
-            except Exception as e:
-                logger.error(f"Error scanning PDF: {e}")
+            file_path, content_hash = await self._save_upload(file)
+
+            existing = await self.resume_repository.get_resume_by_content_hash(content_hash)
+            if existing:
+                self._discard_files([file_path])
+                logger.info(f"File {file.filename} duplicates resume {existing.resume_id}; skipping parse.")
+                return await self._resolve_duplicate(existing, operator), True
+
+            # Scan the PDF in a parse worker process so the event loop stays responsive.
+            # scan_pdf reports a bad PDF as {'error': ...} rather than raising.
+            resume_data = await run_in_parse_pool(scan_pdf, file_path)
+            observe_stage_timings(resume_data.pop('timings', None))
+            if 'error' in resume_data:
+                logger.error(f"Error scanning PDF {file.filename}: {resume_data['error']}")
                 raise HTTPException(status_code=500, detail="Error scanning the PDF.")
+            logger.info("PDF scanned successfully.")
 
-    
-            resume_detail = self.resume_repository.save_resume_detail(
-                name=resume_data['name'],
-                phone_number=resume_data['phone_number'],
-                birthday=resume_data['birthday'],
-                working_exp=resume_data['working_exp'],
-                education=resume_data['education'],
-                area=resume_data['area'],
-                resume_url=file_path,
-                operator=operator,
-                user_id= "null"  
-            )
-            logger.info(f"Resume details for {resume_data['name']} saved to the database.")
-
-            try:
-                self.resume_repository.save_position(
-                    resume_id=resume_detail.resume_id,
-                    name=resume_data['name'],
-                    birthday=resume_data['birthday']
-                )
-                logger.info("Position saved successfully.")
-            except Exception as e:
-                logger.error(f"Error saving position: {e}")
-
-
-            # Save skill information
-            if 'skills' in resume_data and resume_data['skills']:
-                for skill_name in resume_data['skills']:
-                    try:
-                        self.resume_repository.save_skill(
-                            resume_id=resume_detail.resume_id,
-                            skill_name=skill_name,
-                            name=resume_data['name'],
-                            birthday=resume_data['birthday']
-                        )
-                        logger.info(f"Skill {skill_name} saved successfully.")
-                    except Exception as e:
-                        logger.error(f"Error saving skill {skill_name}: {e}")
-            else:
-                self.resume_repository.save_skill(
-                    resume_id=resume_detail.resume_id,
-                    skill_name=None,
-                    name=resume_data['name'],
-                    birthday=resume_data['birthday']
-                )
+            resume_detail = await self.save_resume_data(resume_data, file_path, operator, content_hash)
 
+        except HTTPException:
+            # Nothing was stored, so the uploaded file would be an orphan
+            self._discard_files([file_path])
+            raise
         except Exception as e:
             logger.error(f"Error in upload_resume: {e}")
+            self._discard_files([file_path])
             raise HTTPException(status_code=500, detail="Internal Server Error")
         
 
+        return resume_detail, False
+
+    async def enqueue_resume(self, file, operator):
+        """
+        Save the upload and queue it for background parsing. Returns (job, None), or
+        (None, resume_detail) when the PDF duplicates a stored one and no job is needed.
+        """
+        file_path, content_hash = await self._save_upload(file)
+
+        existing = await self.resume_repository.get_resume_by_content_hash(content_hash)
+        if existing:
+            self._discard_files([file_path])
+            return None, await self._resolve_duplicate(existing, operator)
+
+        job = await parse_jobs.submit(file.filename, file_path, operator, process_parse_job, content_hash=content_hash)
+        logger.info(f"Queued parse job {job.job_id} for {file.filename}.")
+        return job, None
+
+    async def _resolve_duplicate(self, existing, operator):
+        # "link": a new record for this operator pointing at the stored blob; otherwise reuse the existing record
+        if ResumeConfig.DUPLICATE_POLICY == "link":
+            return await self.resume_repository.link_duplicate_resume(existing, operator)
+        return existing
+
+    async def upload_resumes_batch(self, files, operator):
+        """
+        Save many PDFs (or zip archives of PDFs), parse them across the process pool with
+        batched NER, and persist each one. Returns one result entry per PDF.
+        """
+        saved = []  # (filename, file_path, content_hash, error)
+        expanded_left = ResumeConfig.MAX_BATCH_EXPANDED_LENGTH  # bytes zip archives may still expand to
+        try:
+            # Limits are enforced while saving, so an oversized batch (or a zip bomb) is
+            # rejected before it fills the disk
+            for file in files:
+                if file.filename.split('.')[-1].lower() == 'zip':
+                    members, expanded = await run_in_threadpool(
+                        self._save_zip_members, file, ResumeConfig.BATCH_MAX_FILES - len(saved), expanded_left
+                    )
+                    saved.extend(members)
+                    expanded_left -= expanded
+                    continue
+                if len(saved) >= ResumeConfig.BATCH_MAX_FILES:
+                    raise _too_many_files()
+                if file.filename.split('.')[-1].lower() == 'pdf':
+                    try:
+                        saved.append((file.filename, *await self._save_upload(file), None))
+                    except HTTPException as e:
+                        saved.append((file.filename, None, None, e.detail))
+                else:
+                    saved.append((file.filename, None, None, "Invalid file type. Only PDF or ZIP allowed."))
+        except HTTPException:
+            self._discard_files(path for _, path, _, _ in saved)
+            raise
+
+        # Duplicates of stored resumes (or of an earlier file in this batch) are not parsed again
+        duplicates = {}  # file_path -> existing ResumeDetail, or the earlier path in this batch
+        first_path_by_hash = {}
+        for _, path, content_hash, error in saved:
+            if error:
+                continue
+            if content_hash in first_path_by_hash:
+                first_path = first_path_by_hash[content_hash]
+                duplicates[path] = duplicates.get(first_path, first_path)
+                continue
+            existing = await self.resume_repository.get_resume_by_content_hash(content_hash)
+            if existing:
+                duplicates[path] = existing
+            first_path_by_hash[content_hash] = path
+        self._discard_files(duplicates)
+
+        to_parse = [(filename, path) for filename, path, _, error in saved if not error and path not in duplicates]
+        # One chunk per worker (capped at the NER batch size) so every core gets a share of the batch
+        chunk_size = max(1, min(ResumeConfig.NER_BATCH_SIZE, math.ceil(len(to_parse) / ResumeConfig.PARSE_WORKERS)))
+        chunks = [to_parse[i:i + chunk_size] for i in range(0, len(to_parse), chunk_size)]
+        parsed = await asyncio.gather(*(
+            run_in_parse_pool(scan_pdfs, [path for _, path in chunk], ResumeConfig.NER_BATCH_SIZE)
+            for chunk in chunks
+        ))
+        resume_data_by_path = {
+            path: resume_data
+            for chunk, chunk_results in zip(chunks, parsed)
+            for (_, path), resume_data in zip(chunk, chunk_results)
+        }
+        for resume_data in resume_data_by_path.values():
+            observe_stage_timings(resume_data.pop('timings', None))
+
+        # Every successfully parsed PDF is stored in one transaction
+        to_store = []
+        for filename, path, content_hash, error in saved:
+            if error or path in duplicates:
+                continue
+            if 'error' in resume_data_by_path[path]:
+                self._discard_files([path])
+                continue
+            to_store.append({"resume_data": resume_data_by_path[path], "resume_url": path, "operator": operator, "content_hash": content_hash})
+        resume_by_path = {}
+        store_errors = {}  # file_path -> why that resume could not be stored
+        try:
+            stored = await self.save_resumes_data(to_store)
+            resume_by_path = {record["resume_url"]: resume_detail for record, resume_detail in zip(to_store, stored)}
+        except Exception as e:
+            # One bad row fails the whole transaction; store the records one by one so only
+            # the files that really fail are reported (with their own error) and discarded
+            logger.error(f"Error saving batch of {len(to_store)} resumes, retrying one at a time: {e}")
+            for record in to_store:
+                try:
+                    [resume_by_path[record["resume_url"]]] = await self.save_resumes_data([record])
+                except Exception as e:
+                    store_errors[record["resume_url"]] = getattr(e, "detail", None) or "Error saving the resume."
+                    self._discard_files([record["resume_url"]])
+
+        results = []
+        for filename, path, content_hash, error in saved:
+            if error:
+                results.append({"filename": filename, "status": "error", "error": error})
+                continue
+            if path in duplicates:
+                existing = duplicates[path]
+                if isinstance(existing, str):
+                    existing = resume_by_path.get(existing)
+                if existing is None:
+                    results.append({"filename": filename, "status": "error", "error": "Duplicate of a file that failed in this batch."})
+                    continue
+                resume_detail = await self._resolve_duplicate(existing, operator)
+                results.append({
+                    "filename": filename,
+                    "status": "duplicate",
+                    "resume_id": str(resume_detail.resume_id),
+                    "name": resume_detail.name,
+                })
+                continue
+            resume_data = resume_data_by_path[path]
+            if 'error' in resume_data:
+                results.append({"filename": filename, "status": "error", "error": f"Error scanning the PDF: {resume_data['error']}"})
+                continue
+            if path in store_errors:
+                results.append({"filename": filename, "status": "error", "error": store_errors[path]})
+                continue
+            resume_detail = resume_by_path[path]
+            results.append({
+                "filename": filename,
+                "status": "ok",
+                "resume_id": str(resume_detail.resume_id),
+                "name": resume_detail.name,
+            })
+        return results
+
+    def _save_zip_members(self, file, max_entries, max_bytes):
+        """
+        Blocking: run in a thread. Every PDF inside the archive becomes its own upload.
+        Returns (entries, bytes written). Raises 400 (and removes what it wrote) once the
+        archive holds more than `max_entries` files or expands to more than `max_bytes`.
+        """
+        saved = []
+        expanded = 0
+        try:
+            with zipfile.ZipFile(file.file) as archive:
+                for member in archive.infolist():
+                    if member.is_dir():
+                        continue
+                    if len(saved) >= max_entries:
+                        raise _too_many_files()
+                    member_name = f"{file.filename}/{member.filename}"
+                    if member.filename.split('.')[-1].lower() != 'pdf':
+                        saved.append((member_name, None, None, "Invalid file type. Only PDF allowed."))
+                    elif member.file_size > ResumeConfig.MAX_CONTENT_LENGTH:
+                        saved.append((member_name, None, None, "File too large."))
+                    else:
+                        file_path, content_hash, error, size = self._save_zip_member(archive, member, max_bytes - expanded)
+                        expanded += size
+                        saved.append((member_name, file_path, content_hash, error))
+        except zipfile.BadZipFile:
+            saved.append((file.filename, None, None, "Invalid zip archive."))
+        except HTTPException:
+            self._discard_files(path for _, path, _, _ in saved)
+            raise
+        return saved, expanded
+
+    def _save_zip_member(self, archive, member, max_bytes):
+        # The declared size in the archive can't be trusted, so limits are enforced while copying.
+        # Returns (file_path, content_hash, error, bytes written).
+        if member.file_size > max_bytes:
+            raise _batch_too_large()
+        file_path = os.path.join(self._upload_dir(), f"{uuid4()}.pdf")
+        digest = hashlib.sha256()
+        size = 0
+        with archive.open(member) as src, open(file_path, "wb") as dst:
+            while chunk := src.read(ResumeConfig.UPLOAD_CHUNK_SIZE):
+                error = _check_upload_chunk(chunk, size)
+                if error:
+                    break
+                if size + len(chunk) > max_bytes:
+                    dst.close()
+                    self._discard_files([file_path])
+                    raise _batch_too_large()
+                size += len(chunk)
+                digest.update(chunk)
+                dst.write(chunk)
+            else:
+                error = None if size else "Empty file."
+        if error:
+            self._discard_files([file_path])
+            return None, None, getattr(error, "detail", error), 0
+        return file_path, digest.hexdigest(), None, size
+
+    @staticmethod
+    def _discard_files(paths):
+        for path in paths:
+            try:
+                if path and os.path.exists(path):
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _upload_dir(self):
+        upload_dir = "resumes"
+        os.makedirs(upload_dir, exist_ok=True)
+        return upload_dir
+
+    async def _save_upload(self, file):
+        """Stream the upload to disk, hashing it on the way. Returns (file_path, sha256 hex digest)."""
+        # Define the upload directory
+        upload_dir = self._upload_dir()
+
+        # Generate a unique filename
+        file_extension = file.filename.split('.')[-1]
+        unique_filename = f"{uuid4()}.{file_extension}"
+        file_path = os.path.join(upload_dir, unique_filename)
+
+        try:
+        # Save the file chunk by chunk; disk writes run in the threadpool so the event loop never blocks.
+        # Starlette has already spooled the whole part by now (UploadSizeLimitMiddleware caps that
+        # while the body streams in); these checks stop at the first offending chunk so an oversized
+        # or non-PDF part is never copied to the upload directory in full.
+            digest = hashlib.sha256()
+            size = 0
+            with stage_duration.time(stage="file_write"):
+                buffer = await run_in_threadpool(open, file_path, "wb")
+                try:
+                    while chunk := await file.read(ResumeConfig.UPLOAD_CHUNK_SIZE):
+                        error = _check_upload_chunk(chunk, size)
+                        if error:
+                            raise error
+                        size += len(chunk)
+                        await run_in_threadpool(_write_chunk, buffer, digest, chunk)
+                finally:
+                    await run_in_threadpool(buffer.close)
+            if not size:
+                raise HTTPException(status_code=400, detail="Empty file.")
+            logger.info(f"File {file.filename} saved successfully to {file_path}.")
+        except HTTPException:
+            self._discard_files([file_path])
+            raise
+        except Exception as e:
+            logger.error(f"Error saving file: {e}")
+            self._discard_files([file_path])
+            raise HTTPException(status_code=500, detail="Error saving the file.")
+        return file_path, digest.hexdigest()
+
+    async def save_resume_data(self, resume_data, file_path, operator, content_hash=None):
+        """Persist scan_pdf output (detail, position and skills) in one transaction. Returns the ResumeDetail."""
+        [resume_detail] = await self.save_resumes_data([
+            {"resume_data": resume_data, "resume_url": file_path, "operator": operator, "content_hash": content_hash}
+        ])
         return resume_detail
+
+    async def save_resumes_data(self, records):
+        """Persist many parsed resumes with bulk inserts and a single commit; see ResumeRepository.save_parsed_resumes."""
+        resume_details = await self.resume_repository.save_parsed_resumes(records)
+        logger.info(f"Saved {len(resume_details)} resume(s) to the database.")
+        return resume_details
     
 
 #-----------------------------------------------------------------------------------------------
 #---------------get_resume_with_positions_and_skills-------------------------------------------
 #-----------------------------------------------------------------------------------------------
 
-    async def get_resume_with_positions_and_skills(self, resume_id: str, include_pdf: bool = False):
-        data = self.resume_repository.get_resume_detail_with_position_and_skill(resume_id)
-        if not data:
-            raise HTTPException(status_code=404, detail="Resume not found")
-
-        if include_pdf:
-            # Read local PDF and add base64 to JSON payload
-            pdf_path = self.resume_repository.get_resume_file_path(resume_id)
-            if not pdf_path or not os.path.exists(pdf_path):
-                raise HTTPException(status_code=404, detail="PDF file not found on disk")
-            with open(pdf_path, "rb") as f:
-                raw = f.read()
-            data["pdf_base64"] = "data:application/pdf;base64," + base64.b64encode(raw).decode("utf-8")
+    async def get_resume_detail(self, resume_id: str):
+        # Read-through: a resume under review is assembled from the database once per TTL
+        data = resume_detail_cache.get(resume_id)
+        if data is None:
+            data = await self.resume_repository.get_resume_detail_with_position_and_skill(resume_id)
+            if not data:
+                raise HTTPException(status_code=404, detail="Resume not found")
+            resume_detail_cache.put(resume_id, data)
         return data
 
-    async def get_resume_pdf_path(self, resume_id: str) -> str:
-        pdf_path = self.resume_repository.get_resume_file_path(resume_id)
-        if not pdf_path:
+    async def get_resume_details(self, resume_ids: list[str]):
+        """
+        Returns ({requested id: detail}, [ids not found]). Cached details are served from the
+        detail cache; the rest come from one batched repository read and are cached.
+        """
+        details, misses = {}, []
+        for resume_id in dict.fromkeys(resume_ids):
+            data = resume_detail_cache.get(resume_id)
+            if data is None:
+                misses.append(resume_id)
+            else:
+                details[resume_id] = data
+
+        missing = []
+        if misses:
+            found = await self.resume_repository.get_resume_details(misses)
+            for resume_id in misses:
+                # The repository has validated the ids, and keys its result by the canonical form
+                data = found.get(str(uuid.UUID(resume_id)))
+                if data is None:
+                    missing.append(resume_id)
+                    continue
+                resume_detail_cache.put(resume_id, data)
+                details[resume_id] = data
+        return details, missing
+
+    def stream_detail_with_pdf(self, data: dict):
+        """
+        The JSON of `data` plus a "pdf_base64" data URI of the local PDF, as an iterator of
+        byte chunks: the file is base64-encoded a chunk at a time as the response is sent.
+        """
+        pdf_path = data["resume_detail"]["resume_url"]
+        if not pdf_path or not os.path.exists(pdf_path):
+            raise HTTPException(status_code=404, detail="PDF file not found on disk")
+        return _iter_json_with_base64(data, "pdf_base64", "data:application/pdf;base64,", open(pdf_path, "rb"))
+
+    async def get_resume_pdf(self, resume_id: str):
+        """Returns (pdf_path, content_hash); content_hash is None for resumes stored before hashing."""
+        resume_detail = (await self.get_resume_detail(resume_id))["resume_detail"]
+        if not resume_detail["resume_url"]:
             raise HTTPException(status_code=404, detail="Resume not found")
+        return resume_detail["resume_url"], resume_detail.get("content_hash")
+
+    async def get_resume_pdf_path(self, resume_id: str) -> str:
+        pdf_path, _ = await self.get_resume_pdf(resume_id)
         return pdf_path
 
 
@@ -146,12 +423,20 @@ class ResumeService:
 #---------------get_all_resumes_paginated------------------------------------------------------
 #-----------------------------------------------------------------------------------------------
  
-    async def get_all_resumes_paginated(self, page: int, page_size: int):
+    async def get_all_resumes_paginated(self, page: int, page_size: int, cursor: str | None = None):
+        """
+        Returns (rows, next_cursor). With a cursor, `page` is ignored and the page starts right
+        after the row the cursor points at; next_cursor is None on the last page.
+        """
         if page < 1 or page_size < 1:
             raise HTTPException(status_code=400, detail="Invalid page or page_size")
 
-        offset = (page - 1) * page_size
-        rows = self.resume_repository.get_paginated_resumes(offset, page_size)
+        if cursor:
+            gmt_create, resume_id, position_id = _decode_list_cursor(cursor)
+            rows = await self.resume_repository.get_resumes_after_cursor(gmt_create, resume_id, position_id, page_size)
+        else:
+            offset = (page - 1) * page_size
+            rows = await self.resume_repository.get_paginated_resumes(offset, page_size)
 
         # Allow empty pages instead of 404 so the UI can show "No records".
         if rows is None:
@@ -168,20 +453,94 @@ class ResumeService:
             }
             for r in rows
         ]
-        return result
+        next_cursor = _encode_list_cursor(rows[-1]) if len(rows) == page_size else None
+        return result, next_cursor
+
+#-----------------------------------------------------------------------------------------------
+#---------------export_resumes------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    def export_resumes(self, fmt: str, operator=None, created_from=None, created_to=None):
+        """
+        Stream every matching resume as NDJSON (one object per line) or CSV (positions and
+        skills joined with "; "). Filters are checked here, before the 200 goes out.
+        """
+        filters = {
+            "operator": operator,
+            "created_from": _parse_time_filter(created_from, "created_from"),
+            "created_to": _parse_time_filter(created_to, "created_to", end_of_day=True),
+        }
+        return _iter_export(fmt, filters)
+#-----------------------------------------------------------------------------------------------
+#---------------search_resumes------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    async def search_resumes(self, q: str, page: int, page_size: int, **filters):
+        # The index stores gmt_create as ISO text, so bounds are normalised to the same form
+        for name, end_of_day in (("created_from", False), ("created_to", True)):
+            parsed = _parse_time_filter(filters.get(name), name, end_of_day=end_of_day)
+            filters[name] = parsed.isoformat() if parsed else None
+
+        def _search():
+            search_index.ensure_current(search_index_source)
+            return search_index.search(q, offset=(page - 1) * page_size, limit=page_size, **filters)
+
+        try:
+            # SQLite calls are blocking; keep them off the event loop
+            total, hits = await run_in_threadpool(_search)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"data": hits, "total": total, "page": page, "page_size": page_size}
+
+#-----------------------------------------------------------------------------------------------
+#---------------filter_resumes------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    async def filter_resumes(self, expression: str, page: int, page_size: int):
+        def _filter():
+            skill_bitmap_index.ensure_loaded(_iter_index_documents)
+            return skill_bitmap_index.filter(expression, offset=(page - 1) * page_size, limit=page_size)
+
+        try:
+            # The first call per worker loads from the database (later reloads run in the background);
+            # evaluation is C-level big-int work, but still kept off the event loop
+            total, resume_ids = await run_in_threadpool(_filter)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"data": resume_ids, "total": total, "page": page, "page_size": page_size}
+
+#-----------------------------------------------------------------------------------------------
+#---------------rank_resumes--------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+    async def rank_resumes(self, job_description: str, top_k: int):
+        if not job_description.strip():
+            raise HTTPException(status_code=400, detail="job_description is required")
+
+        def _rank():
+            resume_ranker.ensure_loaded(_iter_index_documents)
+            return resume_ranker.rank(job_description, top_k)
+
+        # Loading and scoring are CPU-bound; keep them off the event loop
+        return await run_in_threadpool(_rank)
+
 #-----------------------------------------------------------------------------------------------
 #---------------remove resume--------------------------------------------------------------------
 #-----------------------------------------------------------------------------------------------
 
     async def remove_resume(self, resume_id, db_session):
         # Use repository delete that returns the removed ResumeDetail or None
-        resume = self.resume_repository.delete_resume_tree(resume_id)
+        resume = await self.resume_repository.delete_resume_tree(resume_id)
         if not resume:
             raise HTTPException(status_code=404, detail="Resume not found")
 
-        # Best-effort file removal (ignore if missing)
+        # Best-effort file removal (ignore if missing); linked duplicates may still share the file
         try:
-            if resume.resume_url and os.path.exists(resume.resume_url):
+            if (
+                resume.resume_url
+                and os.path.exists(resume.resume_url)
+                and not await self.resume_repository.count_resumes_by_url(resume.resume_url)
+            ):
                 os.remove(resume.resume_url)
         except Exception:
             # Do not fail deletion if filesystem cleanup fails
@@ -203,7 +562,7 @@ class ResumeService:
         positions = payload.get("positions", None)
         skills = payload.get("skills", None)
 
-        updated = self.resume_repository.update_resume_full(
+        updated = await self.resume_repository.update_resume_full(
             resume_id_str=resume_id,
             detail_updates=detail_updates if detail_updates else None,
             positions=positions if isinstance(positions, list) else None,
@@ -216,5 +575,186 @@ class ResumeService:
         return updated
 
 
+#-----------------------------------------------------------------------------------------------
+#---------------list cursors--------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+def _encode_list_cursor(row):
+    # Opaque to clients: base64url of the sort key of the last row on the page
+    key = [row.gmt_create.isoformat(), str(row.resume_id), str(row.position_id)]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def _decode_list_cursor(cursor):
+    try:
+        gmt_create, resume_id, position_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(gmt_create), uuid.UUID(resume_id), uuid.UUID(position_id)
+    except (ValueError, TypeError, AttributeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+#-----------------------------------------------------------------------------------------------
+#---------------export stream-------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+# Encoded records are sent in chunks of about this many characters rather than one per resume
+_EXPORT_FLUSH_SIZE = 64 * 1024
+
+
+def _parse_time_filter(value, name, end_of_day=False):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}; expected an ISO date or date/time")
+    # A bare date as the upper bound covers that whole day
+    if end_of_day and len(value) == 10:
+        parsed = parsed.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return parsed
+
+
+async def _iter_export(fmt, filters):
+    # The request's session may already be closed while the body streams, so the export opens its own
+    async with AsyncSessionLocal() as db_session:
+        records = AsyncResumeRepository(db_session).stream_export(ResumeConfig.EXPORT_BATCH_SIZE, **filters)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_FIELDS)
+        async for record in records:
+            if writer:
+                record["positions"] = "; ".join(record["positions"])
+                record["skills"] = "; ".join(record["skills"])
+                writer.writerow([record[field] for field in EXPORT_FIELDS])
+            else:
+                buffer.write(json.dumps(record, ensure_ascii=False))
+                buffer.write("\n")
+            if buffer.tell() >= _EXPORT_FLUSH_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+
+#-----------------------------------------------------------------------------------------------
+#---------------streamed base64 embedding-------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+# Multiple of 3 so every chunk encodes to whole base64 quanta (no padding mid-stream)
+_BASE64_READ_SIZE = 3 * 64 * 1024
+
+
+def _iter_json_with_base64(data, key, prefix, source):
+    # `data` is a non-empty, JSON-ready dict; the base64 field is spliced in as its last member
+    try:
+        head = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        yield f'{head[:-1]},{json.dumps(key)}:"{prefix}'.encode("utf-8")
+        pending = b""
+        while chunk := source.read(_BASE64_READ_SIZE):
+            chunk = pending + chunk
+            cut = len(chunk) - len(chunk) % 3
+            pending = chunk[cut:]
+            yield base64.b64encode(chunk[:cut])
+        yield base64.b64encode(pending) + b'"}'
+    finally:
+        source.close()
+
+
+#-----------------------------------------------------------------------------------------------
+#---------------upload helpers------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+def _check_upload_chunk(chunk, size_so_far):
+    """Validate the next chunk of an upload; returns an HTTPException to raise, or None."""
+    if size_so_far == 0 and not chunk.startswith(ResumeConfig.PDF_MAGIC):
+        return HTTPException(status_code=415, detail="Invalid file content. Only PDF allowed.")
+    if size_so_far + len(chunk) > ResumeConfig.MAX_CONTENT_LENGTH:
+        return HTTPException(
+            status_code=413,
+            detail=f"File too large. Max size is {ResumeConfig.MAX_CONTENT_LENGTH // (1024 * 1024)} MB.",
+        )
+    return None
+
+
+def _too_many_files():
+    return HTTPException(status_code=400, detail=f"Too many files; at most {ResumeConfig.BATCH_MAX_FILES} per batch.")
+
+
+def _batch_too_large():
+    limit_mb = ResumeConfig.MAX_BATCH_EXPANDED_LENGTH // (1024 * 1024)
+    return HTTPException(status_code=400, detail=f"Zip archives expand to more than {limit_mb} MB in total.")
+
+
+def _write_chunk(buffer, digest, chunk):
+    digest.update(chunk)
+    buffer.write(chunk)
+
+
+#-----------------------------------------------------------------------------------------------
+#---------------background parse jobs-----------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+async def process_parse_job(job):
+    """
+    ParseJobQueue handler: parse in the process pool, then persist with a job-owned session.
+    On any failure the uploaded file is deleted before the job is marked failed.
+    """
+    try:
+        resume_data = await run_in_parse_pool(scan_pdf, job.file_path)
+        observe_stage_timings(resume_data.pop('timings', None))
+        if 'error' in resume_data:
+            raise ValueError(f"Error scanning the PDF: {resume_data['error']}")
+        return await _persist_parsed_resume(resume_data, job.file_path, job.operator, job.content_hash)
+    except Exception:
+        ResumeService._discard_files([job.file_path])
+        raise
+
+
+async def _persist_parsed_resume(resume_data, file_path, operator, content_hash):
+    # The request session is closed by the time the job finishes, so open a dedicated one
+    async with AsyncSessionLocal() as db_session:
+        resume_service = ResumeService(AsyncResumeRepository(db_session), AsyncUserRepository())
+        resume_detail = await resume_service.save_resume_data(resume_data, file_path, operator, content_hash)
+        return str(resume_detail.resume_id)
+
+
+#-----------------------------------------------------------------------------------------------
+#---------------index loading-------------------------------------------------------------------
+#-----------------------------------------------------------------------------------------------
+
+def _iter_index_documents():
+    # Full index (re)builds read the whole table; they run in a worker thread on the sync engine
+    db_session = SessionLocal()
+    try:
+        yield from ResumeRepository(db_session).iter_search_documents()
+    finally:
+        db_session.close()
+
+
+class SearchIndexSource:
+    """The database side of ResumeSearchIndex.sync(); every call uses its own sync session."""
+
+    def fingerprint(self):
+        return self._call(ResumeRepository.search_index_fingerprint)
+
+    def versions(self):
+        return self._call(ResumeRepository.search_index_versions)
+
+    def documents(self, resume_ids):
+        return self._call(ResumeRepository.get_search_documents, resume_ids)
+
+    def iter_documents(self):
+        return _iter_index_documents()
+
+    @staticmethod
+    def _call(method, *args):
+        db_session = SessionLocal()
+        try:
+            return method(ResumeRepository(db_session), *args)
+        finally:
+            db_session.close()
 
 
+search_index_source = SearchIndexSource()
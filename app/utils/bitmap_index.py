@@ -0,0 +1,343 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from itertools import islice
+from app.config.resume_config import ResumeConfig
+from app.utils.skill_matcher import get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+# Parentheses, quoted terms (optionally prefixed, e.g. area:"new york") or bare words
+_TOKEN_PATTERN = re.compile(r'\s*(\(|\)|[^\s()"]*"[^"]*"|[^\s()]+)')
+_OPERATORS = {"and": "AND", "&": "AND", "&&": "AND", "or": "OR", "|": "OR", "||": "OR", "not": "NOT", "!": "NOT"}
+
+# A term set for fewer than 1 in this many bit positions is stored as a sorted array of 4-byte
+# bit positions instead of an N/8-byte int: cheaper whenever count * 4 < N / 8
+_SPARSE_RATIO = 32
+
+
+class _BitmapState:
+    """
+    The index contents: bit positions, term sets and the live-resume mask.
+
+    A term set is either dense (an int bitset) or sparse (a sorted array("I") of bit
+    positions), whichever is smaller. Areas are free text, so most area terms belong to a
+    handful of resumes; as sparse arrays they cost bytes instead of N/8 each.
+    """
+
+    def __init__(self):
+        self.bit_of: dict[str, int] = {}
+        self.resume_ids: list[str | None] = []  # bit -> resume_id
+        self.keys_of: dict[int, set[str]] = {}  # bit -> terms set for it, to clear on removal
+        self.free: list[int] = []
+        self.bitmaps: dict[str, int | array] = {}
+        self.live = 0
+
+    @classmethod
+    def build(cls, docs):
+        state = cls()
+        # Collect bit positions per term first and build each bitmap once, instead of
+        # OR-ing one bit at a time into ever-growing ints
+        bits_by_key: dict[str, list[int]] = {}
+        for doc in docs:
+            bit, keys = state.assign(doc)
+            for key in keys:
+                bits_by_key.setdefault(key, []).append(bit)
+        size = len(state.resume_ids)
+        state.bitmaps = {key: _pack(bits, size) for key, bits in bits_by_key.items()}
+        state.live = (1 << size) - 1
+        return state
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict):
+        state = cls()
+        state.resume_ids = snapshot["resume_ids"]
+        for bit, resume_id in enumerate(state.resume_ids):
+            if resume_id is None:
+                state.free.append(bit)
+            else:
+                state.bit_of[resume_id] = bit
+                state.live |= 1 << bit
+        size = len(state.resume_ids)
+        terms = [(key, list(_set_bits(int(hex_bits, 16)))) for key, hex_bits in snapshot["bitmaps"].items()]
+        terms += snapshot.get("sparse", {}).items()
+        for key, bits in terms:
+            state.bitmaps[key] = _pack(bits, size)
+            for bit in bits:
+                state.keys_of.setdefault(bit, set()).add(key)
+        return state
+
+    def snapshot(self) -> dict:
+        return {
+            "resume_ids": list(self.resume_ids),
+            "bitmaps": {key: format(bits, "x") for key, bits in self.bitmaps.items() if isinstance(bits, int)},
+            "sparse": {key: bits.tolist() for key, bits in self.bitmaps.items() if not isinstance(bits, int)},
+        }
+
+    def term(self, key: str) -> int:
+        """The term's set as an int bitset, for evaluation (sparse sets are expanded on the fly)."""
+        bits = self.bitmaps.get(key, 0)
+        return bits if isinstance(bits, int) else _bits_to_int(bits, len(self.resume_ids))
+
+    def assign(self, doc: dict):
+        # Give the resume a bit position and work out its terms; bitmaps are left to the caller
+        bit = self.free.pop() if self.free else len(self.resume_ids)
+        if bit == len(self.resume_ids):
+            self.resume_ids.append(doc["resume_id"])
+        else:
+            self.resume_ids[bit] = doc["resume_id"]
+        self.bit_of[doc["resume_id"]] = bit
+
+        keys = {f"skill:{s.lower()}" for s in doc.get("skills") or [] if s}
+        if doc.get("area"):
+            keys.add(f"area:{doc['area'].strip().lower()}")
+        self.keys_of[bit] = keys
+        return bit, keys
+
+    def upsert(self, doc: dict):
+        self.remove(doc["resume_id"])
+        bit, keys = self.assign(doc)
+        self.live |= 1 << bit
+        size = len(self.resume_ids)
+        for key in keys:
+            bits = self.bitmaps.get(key)
+            if isinstance(bits, int):
+                self.bitmaps[key] = bits | (1 << bit)
+                continue
+            if bits is None:
+                bits = self.bitmaps[key] = array("I")
+            insort(bits, bit)
+            if len(bits) * _SPARSE_RATIO >= size:
+                self.bitmaps[key] = _bits_to_int(bits, size)
+
+    def remove(self, resume_id: str):
+        bit = self.bit_of.pop(resume_id, None)
+        if bit is None:
+            return
+        mask = ~(1 << bit)
+        for key in self.keys_of.pop(bit, ()):
+            bits = self.bitmaps[key]
+            if isinstance(bits, int):
+                bits &= mask
+                self.bitmaps[key] = bits
+            else:
+                index = bisect_left(bits, bit)
+                if index < len(bits) and bits[index] == bit:
+                    del bits[index]
+            if not bits:
+                del self.bitmaps[key]  # terms of deleted resumes don't linger
+        self.live &= mask
+        self.resume_ids[bit] = None
+        self.free.append(bit)
+
+
+class SkillBitmapIndex:
+    """
+    Bitmap index from canonical skill ("skill:python") and area ("area:boston") to resume ids.
+
+    Each resume gets a bit position; during evaluation each term is a Python int used as a
+    bitset, so AND/OR/NOT over any number of resumes are single C-level big-integer
+    operations and their cost does not depend on how many skill rows exist. Rare terms are
+    stored sparse (see _BitmapState) and expanded only when a query uses them. Freed bit
+    positions are reused.
+
+    The index is per process. It is loaded from a snapshot (SKILL_BITMAP_PATH, optional) or
+    from the database, kept current by ResumeRepository writes, and reloaded from the
+    database every SKILL_BITMAP_TTL seconds to pick up other workers' writes. Reloads build
+    a new state without holding the lock and swap it in, replaying writes made meanwhile,
+    so filters and writes never wait for the database read.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._lock = threading.Lock()       # guards _state; only held for one filter or write
+        self._load_lock = threading.Lock()  # one (re)load at a time
+        self._state = _BitmapState()
+        self._pending = None                # writes made while a (re)load is building the next state
+        self._loaded_at = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def load(self, docs):
+        """Replace the whole index with `docs` (search documents, see ResumeRepository)."""
+        self._swap(_BitmapState.build(docs))
+
+    def ensure_loaded(self, load_docs):
+        """
+        Load the index on first use (the caller waits, so call it off the event loop). Once
+        loaded, an expired TTL starts a reload in a background thread and the current
+        index keeps serving until the new one is ready.
+        """
+        if not self.loaded:
+            self._reload(load_docs)
+        elif time.monotonic() - self._loaded_at > ResumeConfig.SKILL_BITMAP_TTL and not self._load_lock.locked():
+            threading.Thread(target=self._background_reload, args=(load_docs,), name="skill-bitmap-reload", daemon=True).start()
+
+    def upsert(self, doc: dict):
+        # Nothing to do until the index is first used; it loads everything then
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((_BitmapState.upsert, doc))
+            if self.loaded:
+                self._state.upsert(doc)
+
+    def remove(self, resume_id: str):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((_BitmapState.remove, resume_id))
+            if self.loaded:
+                self._state.remove(resume_id)
+
+    def filter(self, expression: str, offset: int = 0, limit: int = 100):
+        """Resume ids matching a boolean expression, e.g. 'python AND (sql OR area:boston) AND NOT java'. Returns (total, ids)."""
+        tokens = _TOKEN_PATTERN.findall(expression)
+        if not tokens:
+            raise ValueError("Empty filter expression")
+        with self._lock:
+            result, pos = self._parse_or(tokens, 0)
+            if pos != len(tokens):
+                raise ValueError(f"Unexpected '{tokens[pos]}' in filter expression")
+            total = result.bit_count()
+            return total, self._ids_for(result, offset, limit)
+
+    def save(self):
+        """Write a snapshot if SKILL_BITMAP_PATH is set (atomically, so readers never see a partial file)."""
+        if not self.path:
+            return
+        with self._lock:
+            snapshot = self._state.snapshot()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    # ---- loading ----
+
+    def _reload(self, load_docs):
+        with self._load_lock:
+            if self.loaded and time.monotonic() - self._loaded_at <= ResumeConfig.SKILL_BITMAP_TTL:
+                return  # another thread reloaded while we waited
+            from_snapshot = not self.loaded and self.path and os.path.exists(self.path)
+            with self._lock:
+                self._pending = []
+            try:
+                if from_snapshot:
+                    with open(self.path, encoding="utf-8") as f:
+                        state = _BitmapState.from_snapshot(json.load(f))
+                else:
+                    started = time.perf_counter()
+                    state = _BitmapState.build(load_docs())
+                    logger.info(f"Loaded {len(state.bit_of)} resumes into the skill bitmap index in {time.perf_counter() - started:.2f}s.")
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            self._swap(state)
+            if not from_snapshot:
+                self.save()
+
+    def _background_reload(self, load_docs):
+        try:
+            self._reload(load_docs)
+        except Exception as e:
+            logger.error(f"Reloading the skill bitmap index failed: {e}")
+            with self._lock:
+                self._loaded_at = time.monotonic()  # keep serving the current index; retry after the TTL
+
+    def _swap(self, state: _BitmapState):
+        with self._lock:
+            # Writes that happened while `state` was being built may be missing from it
+            for apply, arg in self._pending or ():
+                apply(state, arg)
+            self._pending = None
+            self._state = state
+            self._loaded_at = time.monotonic()
+
+    # ---- expression evaluation (recursive descent: OR < AND < NOT) ----
+
+    def _parse_or(self, tokens, pos):
+        left, pos = self._parse_and(tokens, pos)
+        while pos < len(tokens) and _operator(tokens[pos]) == "OR":
+            right, pos = self._parse_and(tokens, pos + 1)
+            left |= right
+        return left, pos
+
+    def _parse_and(self, tokens, pos):
+        left, pos = self._parse_not(tokens, pos)
+        while pos < len(tokens) and tokens[pos] != ")" and _operator(tokens[pos]) != "OR":
+            if _operator(tokens[pos]) == "AND":  # AND is optional between terms
+                pos += 1
+            right, pos = self._parse_not(tokens, pos)
+            left &= right
+        return left, pos
+
+    def _parse_not(self, tokens, pos):
+        if pos < len(tokens) and _operator(tokens[pos]) == "NOT":
+            operand, pos = self._parse_not(tokens, pos + 1)
+            return self._state.live & ~operand, pos
+        return self._parse_term(tokens, pos)
+
+    def _parse_term(self, tokens, pos):
+        if pos >= len(tokens):
+            raise ValueError("Filter expression ends unexpectedly")
+        token = tokens[pos]
+        if token == "(":
+            value, pos = self._parse_or(tokens, pos + 1)
+            if pos >= len(tokens) or tokens[pos] != ")":
+                raise ValueError("Missing ')' in filter expression")
+            return value, pos + 1
+        if token == ")" or _operator(token):
+            raise ValueError(f"Unexpected '{token}' in filter expression")
+        return self._state.term(_term_key(token)), pos + 1
+
+    def _ids_for(self, bits, offset, limit):
+        # Only the requested page of set bits is turned into ids
+        return [self._state.resume_ids[bit] for bit in islice(_set_bits(bits), offset, offset + limit)]
+
+
+def _operator(token):
+    return _OPERATORS.get(token.lower())
+
+
+def _term_key(token):
+    term = token.strip('"').strip().lower()
+    if term.startswith("area:"):
+        return "area:" + term[len("area:"):].strip('"').strip()
+    if term.startswith("skill:"):
+        term = term[len("skill:"):].strip('"').strip()
+    # Resolve aliases ("golang", "k8s") to the canonical skill id used at index time
+    matches = get_skill_matcher().match(term)
+    return f"skill:{matches[0] if len(matches) == 1 else term}"
+
+
+def _pack(bits, size):
+    # `bits` ascending
+    if len(bits) * _SPARSE_RATIO < size:
+        return array("I", bits)
+    return _bits_to_int(bits, size)
+
+
+def _bits_to_int(bits, size):
+    buffer = bytearray((size + 7) // 8)
+    for bit in bits:
+        buffer[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _set_bits(bits):
+    # bin() walks the bitset in C; str.find then jumps between set bits
+    digits = bin(bits)[:1:-1]  # least significant bit first
+    index = digits.find("1")
+    while index != -1:
+        yield index
+        index = digits.find("1", index + 1)
+
+
+skill_bitmap_index = SkillBitmapIndex(ResumeConfig.SKILL_BITMAP_PATH)
@@ -0,0 +1,70 @@
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from app.config.resume_config import ResumeConfig
+
+
+class ResumeDetailCache:
+    """
+    Bounded LRU cache of assembled resume detail dicts, with a time-to-live per entry.
+
+    Entries are keyed by canonical resume id, so "ABC..." and "abc..." share one entry and
+    invalidation always hits it. The cache is per process: writes in this worker drop the
+    entry at once, writes in other workers show up after at most `ttl` seconds.
+    Callers get deep copies, so mutating a returned dict never changes the cached one.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, resume_id):
+        key = _key(resume_id)
+        if key is None or self.maxsize <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, resume_id, value: dict):
+        key = _key(resume_id)
+        if key is None or self.maxsize <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, resume_id):
+        key = _key(resume_id)
+        if key is None:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _key(resume_id):
+    try:
+        return str(uuid.UUID(str(resume_id)))
+    except ValueError:
+        return None  # the repository rejects malformed ids; nothing to cache
+
+
+resume_detail_cache = ResumeDetailCache(ResumeConfig.DETAIL_CACHE_SIZE, ResumeConfig.DETAIL_CACHE_TTL)
@@ -0,0 +1,36 @@
+import hashlib
+import json
+import os
+from fastapi import Request, Response
+
+
+def content_etag(*parts) -> str:
+    """Strong ETag over JSON-serializable parts (e.g. an assembled resume detail)."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return f'"{hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def file_etag(path: str, content_hash: str | None = None) -> str:
+    """Strong ETag for a stored PDF: its SHA-256 when known, else its size and mtime."""
+    if content_hash:
+        return f'"{content_hash}"'
+    stat = os.stat(path)
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    # If-None-Match uses the weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _strip_weak(etag) in {_strip_weak(tag.strip()) for tag in header.split(",")}
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def _strip_weak(tag):
+    return tag[2:] if tag.startswith("W/") else tag
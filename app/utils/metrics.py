@@ -0,0 +1,242 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.responses import JSONResponse as _JSONResponse
+
+# Latency buckets in seconds: 0.5 ms .. 60 s
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            return [f"{self.name}{self._labels(key)} {_number(v)}" for key, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    """A value that is set, incremented and decremented, or read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=(), callback=None):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._callback = callback  # () -> number, or {label value tuple: number}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def _samples(self):
+        if self._callback is not None:
+            value = self._callback()
+            values = value if isinstance(value, dict) else {(): value}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [f"{self.name}{self._labels(key)} {_number(v)}" for key, v in values.items()]
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram. observe() is a bisect and two additions under a lock; buckets
+    are stored non-cumulative and only summed up when rendered.
+    """
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}  # key -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self):
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        lines = []
+        for key, series in snapshot.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _number(bound)
+                labels = self._labels(key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=(), callback=None) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames, callback))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+# ---- metrics shared across the app ----
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"))
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being served.")
+stage_duration = registry.histogram(
+    "resume_stage_duration_seconds",
+    "Time spent in one stage of resume handling (pdf_decode, segment, ner, extract, file_write, serialize, ...).",
+    ("stage",))
+db_query_duration = registry.histogram("db_query_duration_seconds", "Time per executed SQL statement.", ("engine",))
+db_commit_duration = registry.histogram("db_commit_duration_seconds", "Time per session commit, flush included.")
+db_pool_checkouts = registry.counter("db_pool_checkouts_total", "Connections checked out of the pool.", ("engine",))
+db_pool_checked_out = registry.gauge("db_pool_checked_out", "Connections currently checked out of the pool.", ("engine",))
+parse_pool_tasks = registry.gauge(
+    "parse_pool_tasks", "Calls submitted to the parse process pool and not finished yet (queued or running), from every upload path.")
+parse_jobs_finished = registry.counter("parse_jobs_finished_total", "Background parse jobs finished, by outcome.", ("status",))
+
+
+def observe_stage_timings(timings: dict | None):
+    """Record per-stage timings measured elsewhere (e.g. in a parse worker process)."""
+    for stage, seconds in (timings or {}).items():
+        stage_duration.observe(seconds, stage=stage)
+
+
+class JSONResponse(_JSONResponse):
+    """JSONResponse that records its serialization time as the "serialize" stage."""
+
+    def render(self, content) -> bytes:
+        with stage_duration.time(stage="serialize"):
+            return super().render(content)
+
+
+def instrument_engine(engine, label: str):
+    """Time every statement and count pool checkouts of a (sync) Engine; pass async_engine.sync_engine for async ones."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        db_query_duration.observe(time.perf_counter() - conn.info["query_started"].pop(), engine=label)
+
+    @event.listens_for(engine, "handle_error")
+    def _failed_execute(context):
+        # after_cursor_execute doesn't fire for failed statements
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started and context.cursor is not None:
+            started.pop()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checkouts.inc(engine=label)
+        db_pool_checked_out.inc(engine=label)
+
+    @event.listens_for(engine.pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        db_pool_checked_out.dec(engine=label)
+
+
+def instrument_sessions():
+    """Time commits (flush included) of every ORM session, sync or behind an AsyncSession."""
+    @event.listens_for(Session, "before_commit")
+    def _before_commit(session):
+        session.info["commit_started"] = time.perf_counter()
+
+    @event.listens_for(Session, "after_commit")
+    def _after_commit(session):
+        started = session.info.pop("commit_started", None)
+        if started is not None:
+            db_commit_duration.observe(time.perf_counter() - started)
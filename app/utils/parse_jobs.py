@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from uuid import uuid4
+from app.config.database import AsyncSessionLocal
+from app.config.resume_config import ResumeConfig
+from app.repository.async_parse_job_repository import AsyncParseJobRepository
+from app.utils.metrics import parse_jobs_finished, registry
+
+logger = logging.getLogger(__name__)
+
+_JOB_FIELDS = (
+    "job_id", "filename", "file_path", "operator", "content_hash", "status", "owner",
+    "resume_id", "error", "created_at", "started_at", "finished_at",
+)
+
+
+class ParseJob:
+    def __init__(self, filename, file_path, operator, content_hash=None, job_id=None):
+        self.job_id = job_id or str(uuid4())
+        self.filename = filename
+        self.file_path = file_path
+        self.operator = operator
+        self.content_hash = content_hash
+        self.status = "queued"  # queued -> running -> done | failed
+        self.owner = None
+        self.resume_id = None
+        self.error = None
+        self.created_at = datetime.utcnow().replace(microsecond=0)
+        self.started_at = None
+        self.finished_at = None
+
+    @classmethod
+    def from_record(cls, record):
+        job = cls.__new__(cls)
+        for field in _JOB_FIELDS:
+            setattr(job, field, getattr(record, field))
+        return job
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def fields(self, *names):
+        return {name: getattr(self, name) for name in names or _JOB_FIELDS}
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "filename": self.filename,
+            "resume_id": self.resume_id,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ParseJobQueue:
+    """
+    Registry of resume parse jobs, stored in the parse_job table.
+
+    At most `concurrency` jobs run at once in this API worker; the rest wait in "queued"
+    state. Every state change is written to the table, so any worker can answer a status
+    lookup. Jobs are run by the worker that accepted the upload (the file is on its host's
+    disk); recover() makes a restarted worker pick up the unfinished jobs of workers on the
+    same host that are gone.
+    """
+
+    def __init__(self, concurrency: int, retention_days: int):
+        self._jobs: dict[str, ParseJob] = {}  # unfinished jobs running in this worker
+        self._tasks: set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._retention = timedelta(days=retention_days)
+        self._repository = AsyncParseJobRepository()
+        self.host = socket.gethostname()
+
+    @property
+    def owner(self):
+        # Read per call: a forked worker has a different pid than the process that imported this module
+        return f"{self.host}:{os.getpid()}"
+
+    async def submit(self, filename, file_path, operator, handler, content_hash=None) -> ParseJob:
+        """Register a job and schedule `handler(job)`, which must return the saved resume_id."""
+        job = ParseJob(filename, file_path, operator, content_hash)
+        job.owner = self.owner
+        async with AsyncSessionLocal() as db:
+            await self._repository.insert(db, job.fields())
+        self._start(job, handler)
+        return job
+
+    async def get(self, job_id: str) -> ParseJob | None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        async with AsyncSessionLocal() as db:
+            record = await self._repository.get(db, job_id)
+        return ParseJob.from_record(record) if record else None
+
+    async def recover(self, handler):
+        """
+        Re-queue unfinished jobs left by workers on this host that no longer run (a restart),
+        and delete finished jobs older than the retention period. Called once at startup.
+        """
+        async with AsyncSessionLocal() as db:
+            await self._repository.delete_finished_before(db, datetime.utcnow() - self._retention)
+            records = await self._repository.get_unfinished_on_host(db, self.host)
+            for record in records:
+                if record.job_id in self._jobs or _owner_alive(record.owner, self.owner):
+                    continue
+                if not await self._repository.claim(db, record.job_id, record.owner, self.owner):
+                    continue  # another worker restarting at the same time got it
+                job = ParseJob.from_record(record)
+                job.owner, job.status, job.started_at = self.owner, "queued", None
+                if not os.path.exists(job.file_path or ""):
+                    await self._finish(job, "failed", error="The uploaded file is missing.")
+                    continue
+                logger.info(f"Re-queued parse job {job.job_id} ({job.filename}) left by {record.owner}.")
+                self._start(job, handler)
+
+    def counts(self) -> dict:
+        counts = {"queued": 0, "running": 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
+
+    def _start(self, job: ParseJob, handler):
+        self._jobs[job.job_id] = job
+        task = asyncio.create_task(self._run(job, handler))
+        # Keep a strong reference until the task completes, otherwise it may be garbage collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: ParseJob, handler):
+        async with self._slots:
+            job.status = "running"
+            job.started_at = datetime.utcnow().replace(microsecond=0)
+            await self._store(job, "status", "started_at")
+            try:
+                resume_id = await handler(job)
+            except Exception as e:
+                logger.error(f"Parse job {job.job_id} ({job.filename}) failed: {e}")
+                await self._finish(job, "failed", error=getattr(e, "detail", None) or str(e))
+            else:
+                await self._finish(job, "done", resume_id=resume_id)
+
+    async def _finish(self, job: ParseJob, status, resume_id=None, error=None):
+        job.status, job.resume_id, job.error = status, resume_id, error
+        job.finished_at = datetime.utcnow().replace(microsecond=0)
+        await self._store(job, "status", "resume_id", "error", "finished_at", "owner")
+        self._jobs.pop(job.job_id, None)
+        parse_jobs_finished.inc(status=status)
+
+    async def _store(self, job: ParseJob, *names):
+        try:
+            async with AsyncSessionLocal() as db:
+                await self._repository.update(db, job.job_id, job.fields(*names))
+        except Exception as e:
+            # The job itself carries on; only its status lookups are stale
+            logger.warning(f"Could not record the state of parse job {job.job_id}: {e}")
+
+
+def _owner_alive(owner, current_owner):
+    # Jobs are only recovered on their own host, so a pid check tells whether the owner still runs.
+    # Our own pid means a previous process with the same pid (e.g. a restarted container).
+    pid = owner.rsplit(":", 1)[-1]
+    if owner == current_owner or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+parse_jobs = ParseJobQueue(ResumeConfig.PARSE_WORKERS, ResumeConfig.PARSE_JOB_RETENTION_DAYS)
+
+registry.gauge(
+    "parse_jobs", "Background (async_parse) uploads of this worker, by state; all parse work is in parse_pool_tasks.", ("status",),
+    callback=lambda: {(status,): count for status, count in parse_jobs.counts().items() if status in ("queued", "running")},
+)
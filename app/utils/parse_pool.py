@@ -0,0 +1,58 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from app.config.resume_config import ResumeConfig
+from app.utils.metrics import parse_pool_tasks
+from app.utils.pdf_utils import load_nlp
+
+# Process pool used for CPU-bound PDF parsing (PyPDF2 + spaCy), so it never runs on the event loop.
+# Created lazily so API workers that never parse a resume don't start extra processes.
+_pool: ProcessPoolExecutor | None = None
+_warmup: Future | None = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # With warm-up on, each worker loads the spaCy model as soon as it starts.
+        # Spawned rather than forked: the API process runs threads (threadpool, logging,
+        # index reloads) whose locks a fork could copy in a held state.
+        initializer = load_nlp if ResumeConfig.SPACY_WARMUP else None
+        _pool = ProcessPoolExecutor(
+            max_workers=ResumeConfig.PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer,
+        )
+    return _pool
+
+
+async def run_in_parse_pool(func, *args):
+    # Every parse goes through here (single, batch and background uploads), so this is the pool's backlog
+    loop = asyncio.get_running_loop()
+    parse_pool_tasks.inc()
+    try:
+        return await loop.run_in_executor(get_parse_pool(), func, *args)
+    finally:
+        parse_pool_tasks.dec()
+
+
+def start_parse_pool_warmup():
+    """Start the workers and load the model in the background; see is_parse_pool_ready()."""
+    global _warmup
+    if _warmup is None:
+        _warmup = get_parse_pool().submit(load_nlp)
+
+
+def is_parse_pool_ready() -> bool:
+    # Without warm-up the model loads on the first parse, so the pool is always "ready"
+    if not ResumeConfig.SPACY_WARMUP:
+        return True
+    return _warmup is not None and _warmup.done() and _warmup.exception() is None
+
+
+def shutdown_parse_pool():
+    global _pool, _warmup
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _warmup = None
@@ -1,68 +1,213 @@
 import re
-import spacy
+import threading
+import time
 from PyPDF2 import PdfReader
+from app.config.resume_config import ResumeConfig
+from app.utils.skill_matcher import get_skill_matcher
+from app.utils.resume_sections import segment_resume
+
+# Bump whenever extract_resume_fields (or the skill taxonomy) changes what it extracts;
+# `python -m app.cli.reextract` refreshes every resume stored by an older version.
+PARSER_VERSION = 3
+
+_PHONE_PATTERN = re.compile(r'(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})')
+
+# spaCy's pre-trained English model is loaded on first use (or by load_nlp() in parse workers),
+# not at import time, so API processes that never parse a PDF don't pay for it.
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                # Only NER is used; parser/lemmatizer and their inputs are never loaded
+                _nlp = spacy.load(ResumeConfig.SPACY_MODEL, exclude=ResumeConfig.SPACY_EXCLUDED_PIPES)
+    return _nlp
+
+
+def load_nlp():
+    """Warm-up hook (e.g. a ProcessPoolExecutor initializer)."""
+    get_nlp()
+    return True
+
+
+def is_nlp_loaded():
+    return _nlp is not None
 
-# Load spaCy's pre-trained English model
-nlp = spacy.load("en_core_web_sm")
 
 def scan_pdf(file_path):
     try:
-        # Read the PDF file from the given file path
-        with open(file_path, "rb") as f:
-            reader = PdfReader(f)
-            text = ''
-            for page in reader.pages:
-                text += page.extract_text()
-
-        # Use spaCy to process the extracted text
-        doc = nlp(text)
-
-        # Initialize resume_data dictionary
-        resume_data = {
-            'name': None,
-            'phone_number': None,
-            'birthday': None,
-            'working_exp': None,
-            'education': [],
-            'skills': [],
-            'area': None,
-            'resume_url': file_path
-        }
-
-        # Extract named entities using spaCy NER
-        for ent in doc.ents:
-            if ent.label_ == "PERSON" and not resume_data['name']:
-                resume_data['name'] = ent.text
-            elif ent.label_ == "DATE" and not resume_data['birthday']:
-                resume_data['birthday'] = ent.text
-            elif ent.label_ == "GPE" and not resume_data['area']:
-                resume_data['area'] = ent.text
-
-        # Extract phone number
-        phone_pattern = r'(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
-        phone_match = re.search(phone_pattern, text)
-        if phone_match:
-            resume_data['phone_number'] = phone_match.group(0)
-
-        # Extract skills
-        skills_keywords = ['python', 'java', 'c++', 'javascript', 'sql', 'react', 'angular', 'vue', 'node.js', 'django', 'flask']
-        for keyword in skills_keywords:
-            if re.search(r'\b' + keyword + r'\b', text, re.IGNORECASE):
-                resume_data['skills'].append(keyword)
-
-        # Extract education
-        education_section = re.search(r'Education\n([\s\S]*?)(?=\n\n|\Z)', text, re.IGNORECASE)
-        if education_section:
-            education_text = education_section.group(1)
-            # Simple split by newline, can be improved
-            resume_data['education'] = [line.strip() for line in education_text.split('\n') if line.strip()]
-
-        # Extract work experience
-        experience_section = re.search(r'(Experience|Work History|Professional Experience)\n([\s\S]*?)(?=\n\n|Education|Skills|\Z)', text, re.IGNORECASE)
-        if experience_section:
-            resume_data['working_exp'] = experience_section.group(2).strip()
+        # Stage timings travel back with the result; the API process records them (see app.utils.metrics)
+        timings = {}
+        started = time.perf_counter()
+        text = extract_text(file_path)
+        started = _lap(timings, "pdf_decode", started)
+        sections = segment_resume(text)
+        started = _lap(timings, "segment", started)
 
+        # NER only runs on the header, where the name, location and birth date are
+        doc = get_nlp()(sections["header"])
+        started = _lap(timings, "ner", started)
+
+        resume_data = extract_resume_fields(text, doc, file_path, sections)
+        _lap(timings, "extract", started)
+        resume_data['timings'] = timings
         return resume_data
 
     except Exception as e:
         return {'error': str(e)}
+
+
+def scan_pdfs(file_paths, batch_size=32):
+    """
+    Batch version of scan_pdf: extracts and segments every file's text, then runs NER over
+    all the headers with nlp.pipe. Returns one result per path, in order; failures are
+    {'error': ...} entries.
+    """
+    results = [None] * len(file_paths)
+    texts = []
+    for i, file_path in enumerate(file_paths):
+        try:
+            timings = {}
+            started = time.perf_counter()
+            text = extract_text(file_path)
+            started = _lap(timings, "pdf_decode", started)
+            sections = segment_resume(text)
+            _lap(timings, "segment", started)
+            texts.append((i, text, sections, timings))
+        except Exception as e:
+            results[i] = {'error': str(e)}
+
+    docs = get_nlp().pipe((sections["header"] for _, _, sections, _ in texts), batch_size=batch_size)
+    started = time.perf_counter()
+    for (i, text, sections, timings), doc in zip(texts, docs):
+        try:
+            # nlp.pipe works in batches, so "ner" is the wait for this doc (the batch cost lands on its first doc)
+            started = _lap(timings, "ner", started)
+            results[i] = extract_resume_fields(text, doc, file_paths[i], sections)
+            started = _lap(timings, "extract", started)
+            results[i]['timings'] = timings
+        except Exception as e:
+            results[i] = {'error': str(e)}
+    return results
+
+
+def reextract_fields(items, batch_size=32):
+    """
+    Re-run field extraction for stored resumes. `items` are (resume_id, file_path, text)
+    tuples; the PDF is only decoded when text is None. Returns (resume_id, resume_data)
+    pairs, in order, with {'error': ...} as resume_data for failures.
+    """
+    results = [None] * len(items)
+    texts = []
+    for i, (resume_id, file_path, text) in enumerate(items):
+        try:
+            text = text if text is not None else extract_text(file_path)
+            texts.append((i, text, segment_resume(text)))
+        except Exception as e:
+            results[i] = (resume_id, {'error': str(e)})
+
+    docs = get_nlp().pipe((sections["header"] for _, _, sections in texts), batch_size=batch_size)
+    for (i, text, sections), doc in zip(texts, docs):
+        resume_id, file_path, _ = items[i]
+        try:
+            results[i] = (resume_id, extract_resume_fields(text, doc, file_path, sections))
+        except Exception as e:
+            results[i] = (resume_id, {'error': str(e)})
+    return results
+
+
+def extract_text(file_path, max_pages=None, max_chars=None, early_stop=None):
+    """
+    Text of the PDF, joined once from its pages. Decoding stops after `max_pages` pages, once
+    `max_chars` characters are collected, or (with `early_stop`) after the page on which the
+    header fields are found. Limits default to the PDF_* settings; 0 means no limit.
+    """
+    max_pages = ResumeConfig.PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = ResumeConfig.PDF_MAX_CHARS if max_chars is None else max_chars
+    early_stop = ResumeConfig.PDF_EARLY_STOP if early_stop is None else early_stop
+
+    with open(file_path, "rb") as f:
+        parts = []
+        size = 0
+        for page_text in iter_page_text(PdfReader(f), max_pages):
+            parts.append(page_text)
+            size += len(page_text)
+            if max_chars and size >= max_chars:
+                break
+            if early_stop and _PHONE_PATTERN.search(page_text):
+                # The phone number sits in the header block; name and area come before it
+                break
+    text = "".join(parts)
+    return text[:max_chars] if max_chars else text
+
+
+def iter_page_text(reader, max_pages=0):
+    # Pages are decoded lazily, so pages past a limit are never parsed
+    for number, page in enumerate(reader.pages):
+        if max_pages and number >= max_pages:
+            return
+        yield page.extract_text() or ""
+
+
+def extract_resume_fields(text, doc, file_path, sections=None):
+    """Build the resume_data dict from the raw text, its sections and the spaCy doc of its header."""
+    sections = sections if sections is not None else segment_resume(text)
+
+    # Initialize resume_data dictionary
+    resume_data = {
+        'name': None,
+        'phone_number': None,
+        'birthday': None,
+        'working_exp': None,
+        'education': [],
+        'skills': [],
+        'area': None,
+        'resume_url': file_path,
+        # Kept with the resume so fields can be re-extracted without decoding the PDF again
+        'text': text,
+        'parser_version': PARSER_VERSION
+    }
+
+    # Extract named entities using spaCy NER
+    for ent in doc.ents:
+        if ent.label_ == "PERSON" and not resume_data['name']:
+            resume_data['name'] = ent.text
+        elif ent.label_ == "DATE" and not resume_data['birthday']:
+            resume_data['birthday'] = ent.text
+        elif ent.label_ == "GPE" and not resume_data['area']:
+            resume_data['area'] = ent.text
+
+    # Extract phone number
+    phone_match = _PHONE_PATTERN.search(text)
+    if phone_match:
+        resume_data['phone_number'] = phone_match.group(0)
+
+    # Extract skills (single pass over the text, canonical ids from the skill taxonomy)
+    resume_data['skills'] = get_skill_matcher().match(text)
+
+    # Extract education and work experience from their sections (first block of each, as stored before)
+    education_text = _first_block(sections['education'])
+    if education_text:
+        resume_data['education'] = [line.strip() for line in education_text.split('\n') if line.strip()]
+
+    experience_text = _first_block(sections['experience'])
+    if experience_text:
+        resume_data['working_exp'] = experience_text
+
+    return resume_data
+
+
+def _first_block(section_text):
+    # Up to the first blank line
+    return re.split(r'\n\s*\n', section_text, maxsplit=1)[0].strip()
+
+
+def _lap(timings, stage, started):
+    now = time.perf_counter()
+    timings[stage] = now - started
+    return now
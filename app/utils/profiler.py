@@ -0,0 +1,67 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from uuid import uuid4
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for a single request.
+
+    A background thread snapshots every thread's stack each `interval` seconds and counts
+    identical stacks. The result is written in the folded format ("thread;outer;inner count"),
+    which flamegraph.pl, speedscope and inferno read directly.
+
+    Stacks are sampled process-wide, so requests running concurrently in the same worker
+    show up too; profile on an otherwise idle worker. Parse worker processes are not
+    sampled, only the wait for them.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._stacks[_fold(names.get(thread_id, str(thread_id)), frame)] += 1
+
+
+def profile_path(directory: str, method: str, path: str) -> str:
+    """A unique file name for one request's profile, e.g. 20240101T120000-GET-resume-detail-1a2b3c4d.folded."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-") or "root"
+    return os.path.join(directory, f"{time.strftime('%Y%m%dT%H%M%S')}-{method}-{slug[:80]}-{uuid4().hex[:8]}.folded")
+
+
+def _fold(thread_name, frame):
+    # Functions rather than lines, so samples from the same function stack up into one frame
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    frames.append(thread_name.replace(";", ":"))
+    return ";".join(reversed(frames))
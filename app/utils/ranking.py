@@ -0,0 +1,336 @@
+import logging
+import threading
+import time
+from array import array
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from app.config.resume_config import ResumeConfig
+from app.utils.search_index import education_text
+from app.utils.skill_matcher import get_skill_matcher, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Skills are indexed as their own terms ("skill:python") next to the plain text tokens
+_SKILL_PREFIX = "skill:"
+
+# The delta is merged into the base matrix once it holds more than this plus a quarter of the base's terms
+_MERGE_MIN_NNZ = 100_000
+
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to was we
+were will with you your who what when where which while about across all also any can more most other
+such than then there these they those through using within work working role team teams strong
+experience years year ability skills skill knowledge plus etc must should would including
+""".split())
+
+
+def _document_terms(doc: dict) -> dict[str, int]:
+    # The full extracted text when it was stored (it already holds the experience, education
+    # and area); older resumes only have the truncated field columns
+    if doc.get("text"):
+        text = doc["text"]
+    else:
+        text = " ".join(
+            part for part in (doc.get("working_exp"), education_text(doc.get("education")), doc.get("area"))
+            if part
+        )
+    counts = Counter(tokenize(text))
+    for stopword in _STOPWORDS & counts.keys():
+        del counts[stopword]
+    for skill in _skill_ids(doc.get("skills")):
+        counts[_SKILL_PREFIX + skill] = counts.get(_SKILL_PREFIX + skill, 0) + 1
+    return counts
+
+
+def _skill_ids(skills) -> list[str]:
+    # Stored skills may be free text from PUT ("Rust", "Python3"); job descriptions are matched
+    # to canonical taxonomy ids, so map stored skills the same way (lowercased if not in the taxonomy)
+    matcher = get_skill_matcher()
+    ids = {}
+    for skill in skills or []:
+        if skill and skill.strip():
+            for skill_id in matcher.match(skill) or [skill.strip().lower()]:
+                ids[skill_id] = None
+    return list(ids)
+
+
+class _RankerState:
+    """
+    The ranker's documents as raw term frequencies (one row per resume, one column per term).
+
+    Rows are appended, never rewritten: merged rows live in a CSC matrix (`base`), rows added
+    since the last merge in per-column lists (`delta`), and a removed or replaced resume only
+    has its row marked dead. The delta is merged once it grows past a quarter of the base, so
+    merging costs O(1) per added term amortized. BM25 statistics (document frequency, average
+    length) are computed at rank time for the query's columns only.
+    """
+
+    def __init__(self):
+        self.vocab: dict[str, int] = {}
+        self.row_of: dict[str, int] = {}      # live resume_id -> row
+        self.resume_ids: list[str] = []        # row -> resume_id
+        self.names: list[str | None] = []      # row -> name
+        self.skills: list[frozenset] = []      # row -> skill ids
+        self.alive = array("b")
+        self.doc_len = array("f")              # row -> number of (non-stopword) terms
+        self.total_len = 0.0                   # sum of doc_len over live rows
+        self.base = sparse.csc_matrix((0, 0), dtype=np.float32)
+        self.delta: dict[int, tuple[array, array]] = {}  # column -> (rows, term frequencies)
+        self.delta_nnz = 0
+
+    def upsert(self, doc: dict):
+        self.remove(doc["resume_id"])
+        self.add(doc)
+        if self.delta_nnz > _MERGE_MIN_NNZ + self.base.nnz // 4:
+            self.merge()
+
+    def add(self, doc: dict):
+        row, terms = self._append_row(doc)
+        for term, tf in terms.items():
+            col = self.vocab.setdefault(term, len(self.vocab))
+            entry = self.delta.get(col)
+            if entry is None:
+                entry = self.delta[col] = (array("l"), array("f"))
+            entry[0].append(row)
+            entry[1].append(tf)
+        self.delta_nnz += len(terms)
+
+    def load(self, docs):
+        """Bulk-add `docs` to an empty state: the terms go straight into the base matrix."""
+        rows, cols, tfs = array("l"), array("l"), array("f")
+        vocab = self.vocab
+        for doc in docs:
+            row, terms = self._append_row(doc)
+            for term in [term for term in terms if term not in vocab]:
+                vocab[term] = len(vocab)
+            cols.extend(map(vocab.__getitem__, terms))
+            tfs.extend(terms.values())
+            rows.extend(array("l", [row]) * len(terms))
+        self.base = sparse.csc_matrix(
+            (np.asarray(tfs, dtype=np.float32), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+            shape=(len(self.resume_ids), len(vocab)), dtype=np.float32,
+        )
+
+    def _append_row(self, doc: dict):
+        row = len(self.resume_ids)
+        self.row_of[doc["resume_id"]] = row
+        self.resume_ids.append(doc["resume_id"])
+        self.names.append(doc.get("name"))
+        self.skills.append(frozenset(_skill_ids(doc.get("skills"))))
+        self.alive.append(1)
+        terms = _document_terms(doc)
+        length = float(sum(terms.values()))
+        self.doc_len.append(length)
+        self.total_len += length
+        return row, terms
+
+    def remove(self, resume_id: str):
+        row = self.row_of.pop(resume_id, None)
+        if row is not None:
+            self.alive[row] = 0
+            self.total_len -= self.doc_len[row]
+        # Compact once dead rows make up a quarter of the matrix
+        dead = len(self.alive) - len(self.row_of)
+        if dead > 1000 and dead * 4 > len(self.alive):
+            self.merge(compact=True)
+
+    def merge(self, compact: bool = False):
+        """Fold the delta into the base matrix; with `compact`, also drop dead rows."""
+        base = self.base.tocoo()
+        rows, cols, tfs = [base.row.astype(np.int64)], [base.col.astype(np.int64)], [base.data]
+        for col, (delta_rows, delta_tfs) in self.delta.items():
+            rows.append(np.asarray(delta_rows, dtype=np.int64))
+            cols.append(np.full(len(delta_rows), col, dtype=np.int64))
+            tfs.append(np.asarray(delta_tfs, dtype=np.float32))
+        rows, cols, tfs = np.concatenate(rows), np.concatenate(cols), np.concatenate(tfs)
+
+        n_rows = len(self.resume_ids)
+        if compact:
+            alive = np.array(self.alive, dtype=bool)
+            keep = alive[rows]
+            rows, cols, tfs = (np.cumsum(alive) - 1)[rows[keep]], cols[keep], tfs[keep]
+            kept_rows = np.flatnonzero(alive).tolist()
+            self.resume_ids = [self.resume_ids[r] for r in kept_rows]
+            self.names = [self.names[r] for r in kept_rows]
+            self.skills = [self.skills[r] for r in kept_rows]
+            self.doc_len = array("f", [self.doc_len[r] for r in kept_rows])
+            self.alive = array("b", [1] * len(kept_rows))
+            self.row_of = {resume_id: row for row, resume_id in enumerate(self.resume_ids)}
+            n_rows = len(kept_rows)
+
+        self.base = sparse.csc_matrix((tfs, (rows, cols)), shape=(n_rows, len(self.vocab)), dtype=np.float32)
+        self.delta = {}
+        self.delta_nnz = 0
+
+    def scores(self, query: dict[int, float], k1: float, b: float):
+        """BM25 score of every row for `query` ({column: weight}); dead rows score 0."""
+        n_docs = len(self.row_of)
+        avg_len = self.total_len / n_docs if n_docs else 1.0
+        alive = np.array(self.alive, dtype=bool)
+        doc_len = np.array(self.doc_len, dtype=np.float32)
+
+        all_rows, all_values = [], []
+        for col, weight in query.items():
+            rows, tfs = self._column(col)
+            keep = alive[rows]
+            rows, tfs = rows[keep], tfs[keep]
+            if not len(rows):
+                continue
+            df = len(rows)
+            idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = k1 * (1.0 - b + b * doc_len[rows] / (avg_len or 1.0))
+            all_rows.append(rows)
+            all_values.append(weight * idf * tfs * (k1 + 1.0) / (tfs + norm))
+        if not all_rows:
+            return None
+        return np.bincount(np.concatenate(all_rows), weights=np.concatenate(all_values), minlength=len(self.resume_ids))
+
+    def _column(self, col: int):
+        rows, tfs = [], []
+        if col < self.base.shape[1]:
+            start, end = self.base.indptr[col], self.base.indptr[col + 1]
+            rows.append(self.base.indices[start:end].astype(np.int64))
+            tfs.append(self.base.data[start:end])
+        entry = self.delta.get(col)
+        if entry is not None:
+            rows.append(np.asarray(entry[0], dtype=np.int64))
+            tfs.append(np.asarray(entry[1], dtype=np.float32))
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(rows), np.concatenate(tfs)
+
+
+class ResumeRanker:
+    """
+    BM25 ranking of stored resumes against a job description.
+
+    Resumes are kept as raw term frequencies in a sparse matrix (see _RankerState). Ranking
+    reads only the query's columns: their document frequencies, the BM25 weights of their
+    cells and the per-resume sums are computed with vectorized numpy, then an argpartition
+    picks the top k. No Python loop runs over resumes, and a write never rebuilds the
+    matrix; it appends a row (or marks one dead), with an occasional amortized merge.
+
+    The ranker is per process: changes made by other API workers are picked up when it
+    reloads from the database, every RANK_INDEX_TTL seconds. Reloads run in a background
+    thread and build a new state without the lock, then swap it in and replay the writes
+    made meanwhile, so neither rank requests nor writes wait for the database read.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()       # guards _state; held for one rank or write
+        self._load_lock = threading.Lock()  # one (re)load at a time
+        self._state = _RankerState()
+        self._pending = None                # writes made while a (re)load is building the next state
+        self._loaded_at = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def load(self, docs):
+        """Replace the whole ranker with `docs` (search documents, see ResumeRepository)."""
+        self._swap(self._build(docs))
+
+    def ensure_loaded(self, load_docs):
+        """
+        Load on first use (the caller waits, so call it off the event loop). Once loaded, an
+        expired TTL starts a reload in a background thread; ranking carries on meanwhile.
+        """
+        if not self.loaded:
+            self._reload(load_docs)
+        elif time.monotonic() - self._loaded_at > ResumeConfig.RANK_INDEX_TTL and not self._load_lock.locked():
+            threading.Thread(target=self._background_reload, args=(load_docs,), name="ranker-reload", daemon=True).start()
+
+    def upsert(self, doc: dict):
+        # Nothing to do until the ranker is first used; it loads everything from the database then
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((_RankerState.upsert, doc))
+            if self.loaded:
+                self._state.upsert(doc)
+
+    def remove(self, resume_id: str):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((_RankerState.remove, resume_id))
+            if self.loaded:
+                self._state.remove(resume_id)
+
+    def rank(self, job_description: str, top_k: int = 20) -> list[dict]:
+        query_skills = get_skill_matcher().match(job_description)
+        query_terms: dict[str, float] = {}
+        for token in tokenize(job_description):
+            if token not in _STOPWORDS:
+                query_terms[token] = query_terms.get(token, 0.0) + 1.0
+        for skill in query_skills:
+            query_terms[_SKILL_PREFIX + skill] = ResumeConfig.RANK_SKILL_WEIGHT
+
+        with self._lock:
+            state = self._state
+            query = {state.vocab[t]: weight for t, weight in query_terms.items() if t in state.vocab}
+            scores = state.scores(query, self.k1, self.b) if query else None
+            if scores is None:
+                return []
+
+            top_k = min(top_k, int(np.count_nonzero(scores > 0)))
+            if top_k <= 0:
+                return []
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            top = top[np.argsort(-scores[top])]
+
+            query_skill_set = set(query_skills)
+            return [
+                {
+                    "resume_id": state.resume_ids[row],
+                    "name": state.names[row],
+                    "score": round(float(scores[row]), 4),
+                    "matched_skills": sorted(state.skills[row] & query_skill_set),
+                }
+                for row in top
+            ]
+
+    # ---- loading ----
+
+    def _build(self, docs):
+        state = _RankerState()
+        state.load(docs)
+        return state
+
+    def _reload(self, load_docs):
+        with self._load_lock:
+            if self.loaded and time.monotonic() - self._loaded_at <= ResumeConfig.RANK_INDEX_TTL:
+                return  # another thread reloaded while we waited
+            with self._lock:
+                self._pending = []
+            try:
+                started = time.perf_counter()
+                state = self._build(load_docs())
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            self._swap(state)
+            logger.info(f"Loaded {len(state.row_of)} resumes into the ranker in {time.perf_counter() - started:.2f}s.")
+
+    def _background_reload(self, load_docs):
+        try:
+            self._reload(load_docs)
+        except Exception as e:
+            logger.error(f"Reloading the ranker failed: {e}")
+            with self._lock:
+                self._loaded_at = time.monotonic()  # keep ranking with the current state; retry after the TTL
+
+    def _swap(self, state: _RankerState):
+        with self._lock:
+            # Writes that happened while `state` was being built may be missing from it
+            for apply, arg in self._pending or ():
+                apply(state, arg)
+            self._pending = None
+            self._state = state
+            self._loaded_at = time.monotonic()
+
+
+resume_ranker = ResumeRanker()
@@ -0,0 +1,59 @@
+import logging
+import time
+from fastapi.concurrency import run_in_threadpool
+from app.config.resume_config import ResumeConfig
+from app.utils.metrics import http_request_duration, http_requests_in_flight
+from app.utils.profiler import SamplingProfiler, profile_path
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware that times every HTTP request into http_request_duration_seconds.
+
+    Requests are labelled by route template ("/resume/detail/{resume_id}") rather than raw
+    path, so ids don't explode the number of series. With PROFILING_ENABLED, a request
+    carrying an X-Profile header is also run under the sampling profiler; the profile's
+    file name comes back in the X-Profile-File response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler = None
+        if ResumeConfig.PROFILING_ENABLED and b"x-profile" in dict(scope["headers"]):
+            profiler = SamplingProfiler(ResumeConfig.PROFILE_INTERVAL)
+            output_path = profile_path(ResumeConfig.PROFILE_DIR, scope["method"], scope["path"])
+
+        status = 500  # if the app fails before starting a response
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if profiler is not None:
+                    message["headers"] = [*message.get("headers", []), (b"x-profile-file", output_path.encode())]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        if profiler is not None:
+            profiler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            http_request_duration.observe(elapsed, method=scope["method"], route=route, status=status)
+            if profiler is not None:
+                profiler.stop()
+                await run_in_threadpool(profiler.write, output_path)
+                logger.info(f"Profile of {scope['method']} {scope['path']} written to {output_path}.")
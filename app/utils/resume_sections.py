@@ -0,0 +1,63 @@
+import re
+
+# Heading line (lowercased, trailing punctuation stripped) -> section it starts
+_HEADINGS = {
+    **dict.fromkeys((
+        "experience", "work experience", "professional experience", "work history",
+        "employment", "employment history", "career history", "relevant experience",
+    ), "experience"),
+    **dict.fromkeys((
+        "education", "education and training", "academic background", "academic qualifications",
+        "qualifications", "academics",
+    ), "education"),
+    **dict.fromkeys((
+        "skills", "technical skills", "key skills", "core competencies", "competencies",
+        "skills and abilities", "technologies", "tech stack",
+    ), "skills"),
+    # Sections holding the name, birth date or location are part of the header, which NER reads
+    # ("Curriculum Vitae / Personal Information / Name: ... / Date of Birth: ...")
+    **dict.fromkeys((
+        "contact", "contact information", "contact details", "personal information",
+        "personal details", "personal data", "personal info", "profile", "about me",
+    ), "header"),
+    # Headings we don't extract from; they only end the previous section
+    **dict.fromkeys((
+        "summary", "professional summary", "objective", "career objective",
+        "projects", "personal projects", "certifications", "certificates", "awards", "achievements",
+        "publications", "languages", "interests", "hobbies", "references", "volunteer experience",
+        "volunteering", "activities",
+    ), "other"),
+}
+_MAX_HEADING_LEN = max(len(h) for h in _HEADINGS)
+_HEADING_TRIM = re.compile(r'^[\W_]+|[\W_]+$')
+
+# NER input when the text has no recognizable heading, and a cap on the header either way
+HEADER_FALLBACK_CHARS = 1000
+HEADER_MAX_CHARS = 3000
+
+
+def segment_resume(text: str) -> dict[str, str]:
+    """
+    Split resume text into header, experience, education, skills and other sections in one
+    pass over its lines. The header is everything before the first known heading plus any
+    contact/personal-details sections; a section runs until the next heading, and repeated
+    sections are concatenated.
+    """
+    sections = {"header": [], "experience": [], "education": [], "skills": [], "other": []}
+    current = "header"
+    found_heading = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped and len(stripped) <= _MAX_HEADING_LEN + 2:
+            section = _HEADINGS.get(_HEADING_TRIM.sub("", stripped).lower())
+            if section:
+                current = section
+                found_heading = True
+                continue
+        sections[current].append(line)
+
+    result = {name: "\n".join(lines).strip() for name, lines in sections.items()}
+    if not found_heading or not result["header"]:
+        result["header"] = text[:HEADER_FALLBACK_CHARS]
+    result["header"] = result["header"][:HEADER_MAX_CHARS]
+    return result
@@ -0,0 +1,281 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from app.config.resume_config import ResumeConfig
+
+logger = logging.getLogger(__name__)
+
+# Documents written per transaction while reconciling with the database
+_SYNC_BATCH_SIZE = 500
+
+# bm25() weights, in resume_fts column order: name, skills, area, working_exp, education
+_BM25_WEIGHTS = (5.0, 4.0, 2.0, 1.0, 1.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_doc (
+    id INTEGER PRIMARY KEY,
+    resume_id TEXT NOT NULL UNIQUE,
+    operator TEXT,
+    gmt_create TEXT,
+    gmt_modify TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_resume_doc_operator ON resume_doc (operator);
+CREATE INDEX IF NOT EXISTS ix_resume_doc_gmt_create ON resume_doc (gmt_create);
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+    name, skills, area, working_exp, education,
+    tokenize = "unicode61 remove_diacritics 2 tokenchars '+#'"
+);
+"""
+
+
+class ResumeSearchIndex:
+    """
+    Embedded full-text index (SQLite FTS5) over the fields scan_pdf extracts.
+
+    It lives in its own SQLite file next to the app, whatever database backs the app, and
+    is shared by all API workers on the host. resume_fts rows share their rowid with
+    resume_doc, which holds the filterable columns and the resume_id -> rowid lookup.
+
+    Writes made through this host are applied as they happen. Every
+    SEARCH_INDEX_RECONCILE_INTERVAL seconds the index is compared with the database, so
+    writes from other hosts (and index writes that failed) are picked up; see sync().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()  # sqlite3 connections are per thread
+        self._sync_lock = threading.Lock()
+        self._synced_at = None
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(resume_doc)")}
+            if "gmt_modify" not in columns:
+                # Index files from before gmt_modify was kept; the next sync fills it in
+                with conn:
+                    conn.execute("ALTER TABLE resume_doc ADD COLUMN gmt_modify TEXT")
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, doc: dict):
+        """Add or replace one resume; `doc` comes from ResumeRepository search documents."""
+        self.upsert_many([doc])
+
+    def upsert_many(self, docs):
+        conn = self._conn()
+        with conn:
+            for doc in docs:
+                # INSERT OR IGNORE first: it takes the write lock, so the lookup below can't race
+                # another worker inserting the same resume
+                conn.execute("INSERT OR IGNORE INTO resume_doc (resume_id) VALUES (?)", (doc["resume_id"],))
+                conn.execute(
+                    "UPDATE resume_doc SET operator = ?, gmt_create = ?, gmt_modify = ? WHERE resume_id = ?",
+                    (doc.get("operator"), doc.get("gmt_create"), doc.get("gmt_modify"), doc["resume_id"]),
+                )
+                doc_id = conn.execute("SELECT id FROM resume_doc WHERE resume_id = ?", (doc["resume_id"],)).fetchone()[0]
+                conn.execute("DELETE FROM resume_fts WHERE rowid = ?", (doc_id,))
+                conn.execute(
+                    "INSERT INTO resume_fts (rowid, name, skills, area, working_exp, education) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        doc_id,
+                        doc.get("name") or "",
+                        " ".join(s for s in doc.get("skills") or [] if s),
+                        doc.get("area") or "",
+                        doc.get("working_exp") or "",
+                        education_text(doc.get("education")),
+                    ),
+                )
+
+    def remove(self, resume_id: str):
+        self.remove_many([resume_id])
+
+    def remove_many(self, resume_ids):
+        conn = self._conn()
+        with conn:
+            for resume_id in resume_ids:
+                row = conn.execute("SELECT id FROM resume_doc WHERE resume_id = ?", (resume_id,)).fetchone()
+                if row:
+                    conn.execute("DELETE FROM resume_fts WHERE rowid = ?", (row[0],))
+                    conn.execute("DELETE FROM resume_doc WHERE id = ?", (row[0],))
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM resume_doc").fetchone()[0]
+
+    def fingerprint(self):
+        """(number of resumes, latest gmt_modify), comparable with ResumeRepository.search_index_fingerprint()."""
+        count, last_modified = self._conn().execute("SELECT COUNT(*), MAX(gmt_modify) FROM resume_doc").fetchone()
+        return count, last_modified
+
+    def rebuild(self, docs):
+        """Replace the whole index with `docs` (an iterable of search documents)."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM resume_fts")
+            conn.execute("DELETE FROM resume_doc")
+        batch = []
+        for doc in docs:
+            batch.append(doc)
+            if len(batch) >= _SYNC_BATCH_SIZE:
+                self.upsert_many(batch)
+                batch = []
+        self.upsert_many(batch)
+
+    def reconcile(self, source):
+        """
+        Bring the index in line with the database: upsert resumes that are missing or whose
+        gmt_modify differs, remove resumes that no longer exist. `source` reads the database
+        (see resume_service.SearchIndexSource). Returns (upserted, removed).
+        """
+        indexed = dict(self._conn().execute("SELECT resume_id, gmt_modify FROM resume_doc"))
+        stored = source.versions()
+        stale = [resume_id for resume_id, modified in stored.items() if resume_id not in indexed or indexed[resume_id] != modified]
+        gone = [resume_id for resume_id in indexed if resume_id not in stored]
+        for start in range(0, len(stale), _SYNC_BATCH_SIZE):
+            self.upsert_many(source.documents(stale[start:start + _SYNC_BATCH_SIZE]))
+        self.remove_many(gone)
+        return len(stale), len(gone)
+
+    def sync(self, source):
+        """Reconcile if the index and the database disagree on (count, latest gmt_modify)."""
+        with self._sync_lock:
+            started = time.perf_counter()
+            if self.fingerprint() != source.fingerprint():
+                upserted, removed = self.reconcile(source)
+                logger.info(
+                    f"Search index reconciled with the database in {time.perf_counter() - started:.2f}s: "
+                    f"{upserted} resumes (re)indexed, {removed} removed."
+                )
+            self._synced_at = time.monotonic()
+
+    def ensure_current(self, source):
+        """
+        First search in this process: sync before answering (the caller waits, so call it off
+        the event loop). Later, once the interval has passed, sync in a background thread.
+        """
+        if self._synced_at is None:
+            self.sync(source)
+        elif (
+            time.monotonic() - self._synced_at > ResumeConfig.SEARCH_INDEX_RECONCILE_INTERVAL
+            and not self._sync_lock.locked()
+        ):
+            threading.Thread(target=self._background_sync, args=(source,), name="search-index-sync", daemon=True).start()
+
+    def _background_sync(self, source):
+        try:
+            self.sync(source)
+        except Exception as e:
+            logger.error(f"Reconciling the search index failed: {e}")
+            self._synced_at = time.monotonic()  # retry after the interval
+
+    def search(self, q: str, operator=None, area=None, skill=None, created_from=None, created_to=None,
+               offset: int = 0, limit: int = 10):
+        """
+        Ranked matches for `q` (all terms must match; a trailing * makes a term a prefix). Returns
+        (total, hits). Without terms, every resume passing the operator/date filters is returned,
+        newest first; with neither terms nor filters a ValueError is raised. created_from and
+        created_to are ISO strings, compared with the stored ISO gmt_create.
+        """
+        match = _match_expression(q)
+        if _match_expression(area):
+            match = _and(match, f"area : ({_match_expression(area)})")
+        if _match_expression(skill):
+            match = _and(match, f"skills : ({_match_expression(skill)})")
+        if not match and not (operator or created_from or created_to):
+            raise ValueError("Give search terms or at least one filter")
+
+        where = ["resume_fts MATCH ?"] if match else []
+        params = [match] if match else []
+        if operator:
+            where.append("d.operator = ?")
+            params.append(operator)
+        if created_from:
+            where.append("d.gmt_create >= ?")
+            params.append(created_from)
+        if created_to:
+            where.append("d.gmt_create <= ?")
+            params.append(created_to)
+        where_sql = " AND ".join(where)
+
+        conn = self._conn()
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM resume_fts f JOIN resume_doc d ON d.id = f.rowid WHERE {where_sql}",
+            params,
+        ).fetchone()[0]
+        if match:
+            rows = conn.execute(
+                f"""
+                SELECT d.resume_id, f.name, f.area, d.operator, d.gmt_create,
+                       bm25(resume_fts, {", ".join(str(w) for w in _BM25_WEIGHTS)}) AS score,
+                       snippet(resume_fts, -1, '<b>', '</b>', '…', 12) AS snippet
+                FROM resume_fts f JOIN resume_doc d ON d.id = f.rowid
+                WHERE {where_sql}
+                ORDER BY score
+                LIMIT ? OFFSET ?
+                """,
+                [*params, limit, offset],
+            ).fetchall()
+        else:
+            # Filters only: nothing to rank by, so newest first (served by the gmt_create index)
+            rows = conn.execute(
+                f"""
+                SELECT d.resume_id, f.name, f.area, d.operator, d.gmt_create, NULL, NULL
+                FROM resume_doc d JOIN resume_fts f ON f.rowid = d.id
+                WHERE {where_sql}
+                ORDER BY d.gmt_create DESC, d.id DESC
+                LIMIT ? OFFSET ?
+                """,
+                [*params, limit, offset],
+            ).fetchall()
+
+        hits = [
+            {
+                "resume_id": r[0],
+                "name": r[1] or None,
+                "area": r[2] or None,
+                "operator": r[3],
+                "gmt_create": r[4],
+                "score": -r[5] if r[5] is not None else None,  # bm25() is "lower is better"; expose "higher is better"
+                "snippet": r[6],
+            }
+            for r in rows
+        ]
+        return total, hits
+
+
+def _match_expression(q):
+    # Quote every term so user input can't inject FTS5 query syntax
+    terms = []
+    for term in (q or "").split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _and(left, right):
+    return f"{left} AND {right}" if left else right
+
+
+def education_text(education):
+    # resume_detail.education is stored as a JSON list of lines
+    if not education:
+        return ""
+    if isinstance(education, str):
+        try:
+            education = json.loads(education)
+        except ValueError:
+            return education
+    if isinstance(education, (list, tuple)):
+        return "\n".join(str(line) for line in education)
+    return str(education)
+
+
+search_index = ResumeSearchIndex(ResumeConfig.SEARCH_INDEX_PATH)
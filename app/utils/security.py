@@ -1,15 +1,28 @@
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import bcrypt
 import os
+import threading
+import time
+from app.utils.metrics import registry
 
 # Environment variables or hardcoded values for your JWT configuration
 SECRET_KEY = os.getenv("JWT_SECRET", "secret")  # You should store the secret in environment variables
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # Default expiration of 1 day
 
+# bcrypt runs on its own small pool so a login storm can't starve the shared threadpool
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", min(4, os.cpu_count() or 1)))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", 64))  # running + queued; beyond this logins get 503
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 4096))  # verified tokens kept per worker; 0 disables the cache
+# Require a bearer token on the read endpoints (detail, PDF, list, search, filter, rank, job status)
+PROTECT_READ_ENDPOINTS = os.getenv("PROTECT_READ_ENDPOINTS", "false").lower() in ("1", "true", "yes")
+
 # OAuth2PasswordBearer is used to extract the token from the request headers
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -21,6 +34,43 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
+
+_password_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_password_pending = 0
+
+registry.gauge("password_hash_pending", "bcrypt calls running or queued.", callback=lambda: _password_pending)
+_password_wait = registry.histogram("password_hash_queue_wait_seconds", "Time a bcrypt call waited for a free worker.")
+_password_duration = registry.histogram("password_hash_duration_seconds", "Time per bcrypt call.", ("operation",))
+_password_rejected = registry.counter("password_hash_rejected_total", "bcrypt calls refused because the queue was full.")
+
+
+async def run_password_hashing(func, *args):
+    """
+    Run hash_password/verify_password on the bcrypt pool (bcrypt releases the GIL, so calls
+    run in parallel). At most BCRYPT_MAX_PENDING calls run or wait; further ones get a 503
+    right away instead of queueing behind a login storm.
+    """
+    global _password_pending
+    if _password_pending >= BCRYPT_MAX_PENDING:
+        _password_rejected.inc()
+        raise HTTPException(status_code=503, detail="Too many login attempts in progress, retry shortly.", headers={"Retry-After": "1"})
+
+    submitted = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        _password_wait.observe(started - submitted)
+        try:
+            return func(*args)
+        finally:
+            _password_duration.observe(time.perf_counter() - started, operation=func.__name__)
+
+    _password_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, timed)
+    finally:
+        _password_pending -= 1
+
 # Creating a JWT access token
 def create_access_token(data: dict, expires_delta: int = ACCESS_TOKEN_EXPIRE_MINUTES):
     to_encode = data.copy()
@@ -29,16 +79,66 @@ def create_access_token(data: dict, expires_delta: int = ACCESS_TOKEN_EXPIRE_MIN
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class TokenClaimsCache:
+    """
+    LRU cache of verified token -> (subject, exp), so repeat requests with the same token
+    skip signature verification. An entry is only served until the token's own exp.
+    Tokens that fail verification are never cached.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return entry[0]
+
+    def put(self, token: str, subject: str, exp: float):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (subject, exp)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+token_claims_cache = TokenClaimsCache(TOKEN_CACHE_SIZE)
+
+
 # Function to get the current user's username from the JWT token
-def get_current_user_username(token: str = Depends(oauth2_scheme)) -> str:
+async def get_current_user_username(token: str = Depends(oauth2_scheme)) -> str:
+    # Async so FastAPI calls it on the event loop; a cache hit is a dict lookup, a miss one HMAC check
+    email = token_claims_cache.get(token)
+    if email is not None:
+        return email
     try:
         # Decode the JWT token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             raise HTTPException(status_code=403, detail="Could not validate credentials")
-        
+
+        # Tokens from create_access_token always carry exp; without one, don't cache
+        if payload.get("exp") is not None:
+            token_claims_cache.put(token, email, float(payload["exp"]))
         # Here we use the email to identify the user, or you can store the username in the token
         return email  # You can replace `email` with `username` if stored in the token
     except JWTError:
         raise HTTPException(status_code=403, detail="Could not validate credentials")
+
+
+async def require_read_access(request: Request) -> str | None:
+    """Route dependency for read endpoints: a no-op unless PROTECT_READ_ENDPOINTS is set."""
+    if not PROTECT_READ_ENDPOINTS:
+        return None
+    return await get_current_user_username(await oauth2_scheme(request))
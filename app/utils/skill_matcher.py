@@ -0,0 +1,71 @@
+import json
+import re
+from functools import lru_cache
+from app.config.resume_config import ResumeConfig
+
+# Lowercase word tokens that keep the punctuation used in skill names: "c++", "c#", "node.js", ".net".
+# A token never ends in "." so "Python." at the end of a sentence still reads as "python".
+_TOKEN_PATTERN = re.compile(r'\.?[a-z0-9](?:[a-z0-9+#.]*[a-z0-9+#])?')
+
+
+def tokenize(text):
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Single-pass phrase matcher over a skill taxonomy.
+
+    Every alias is tokenized once into a tuple key, so matching is a dictionary lookup per
+    token position (trying at most `max_phrase_len` phrase lengths): the cost grows with the
+    text, not with the number of skills. Longest match wins and matches don't overlap.
+    """
+
+    def __init__(self, taxonomy: dict):
+        self._phrases: dict[tuple, str] = {}
+        self._first_tokens: set[str] = set()
+        self.max_phrase_len = 1
+
+        for skill_id, entry in taxonomy.items():
+            # Entries are either a list of aliases, or {"aliases": [...], "match_id": false}
+            # for ids that are too ambiguous to match on their own (e.g. "go", "c")
+            if isinstance(entry, dict):
+                aliases = list(entry.get("aliases", []))
+                if entry.get("match_id", True):
+                    aliases.append(skill_id)
+            else:
+                aliases = [skill_id, *entry]
+
+            for alias in aliases:
+                phrase = tuple(tokenize(alias))
+                if not phrase:
+                    continue
+                self._phrases.setdefault(phrase, skill_id.lower())
+                self._first_tokens.add(phrase[0])
+                self.max_phrase_len = max(self.max_phrase_len, len(phrase))
+
+    def match(self, text) -> list[str]:
+        """Canonical skill ids found in `text`, in order of first appearance."""
+        tokens = tokenize(text)
+        found = {}
+        i = 0
+        while i < len(tokens):
+            if tokens[i] in self._first_tokens:
+                for size in range(min(self.max_phrase_len, len(tokens) - i), 0, -1):
+                    skill_id = self._phrases.get(tuple(tokens[i:i + size]))
+                    if skill_id:
+                        found[skill_id] = None
+                        i += size
+                        break
+                else:
+                    i += 1
+            else:
+                i += 1
+        return list(found)
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    # Built once per process from the taxonomy file
+    with open(ResumeConfig.SKILL_TAXONOMY_PATH, encoding="utf-8") as f:
+        return SkillMatcher(json.load(f))
@@ -0,0 +1,53 @@
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from app.config.resume_config import ResumeConfig
+
+# Multipart framing (boundaries, part headers, other form fields) on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Pure ASGI middleware that caps request bodies on the upload routes before they are parsed.
+
+    A declared Content-Length over the limit is answered with 413 without reading the body;
+    bodies without one (chunked transfer) are counted as they stream in and aborted once they
+    cross the limit, so the multipart parser never spools more than the limit to disk.
+    """
+
+    def __init__(self, app, limits: dict[str, int] | None = None):
+        self.app = app
+        self.limits = limits or {
+            "/resume/upload": ResumeConfig.MAX_CONTENT_LENGTH + MULTIPART_OVERHEAD,
+            "/resume/upload/batch": ResumeConfig.MAX_BATCH_CONTENT_LENGTH,
+        }
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": _too_large_detail(limit)}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside body parsing; FastAPI re-raises HTTPExceptions from there as-is
+                    raise HTTPException(status_code=413, detail=_too_large_detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def _too_large_detail(limit):
+    return f"Request body too large. Max size is {limit // (1024 * 1024)} MB."
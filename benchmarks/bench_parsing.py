@@ -0,0 +1,143 @@
+"""
+Parsing micro-benchmarks over a deterministic synthetic resume corpus.
+
+    python -m benchmarks.bench_parsing [--per-case 5] [--repeat 3] [--output results.json]
+    python -m benchmarks.bench_parsing --output new.json --compare baseline.json [--threshold 0.10]
+
+Each stage of scan_pdf is timed on its own, per document: PDF decode (extract_text),
+section segmentation, NER on the header, regex/skill field extraction, skill matching alone,
+date parsing (_parse_birthday) and the whole scan_pdf. Results are JSON (count, throughput,
+mean and p50/p95/p99 in milliseconds per stage). With --compare, stages whose p50 got slower
+than the threshold are reported and the exit code is 1, so the run can gate a deploy.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# The repository module pulls in the database config; benchmarks never touch a database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.repository.resume_repository import _parse_birthday  # noqa: E402
+from app.utils.pdf_utils import PARSER_VERSION, extract_resume_fields, extract_text, get_nlp, scan_pdf  # noqa: E402
+from app.utils.resume_sections import segment_resume  # noqa: E402
+from app.utils.skill_matcher import get_skill_matcher  # noqa: E402
+from benchmarks.stats import summarize  # noqa: E402
+from benchmarks.synthetic_pdf import generate_corpus, random_date_string  # noqa: E402
+
+STAGES = ("decode", "segment", "ner", "extract_fields", "skill_match", "parse_birthday", "scan_pdf")
+
+
+def run(corpus, repeat: int, dates_per_doc: int, seed: int):
+    timings = {stage: [] for stage in STAGES}
+    # Load models and compiled patterns outside the timed region
+    nlp = get_nlp()
+    matcher = get_skill_matcher()
+    rng = random.Random(seed)
+    dates = [random_date_string(rng) for _ in range(dates_per_doc)]
+
+    for _ in range(repeat):
+        for path, _, _, _ in corpus:
+            text = _timed(timings["decode"], extract_text, path)
+            sections = _timed(timings["segment"], segment_resume, text)
+            doc = _timed(timings["ner"], nlp, sections["header"])
+            _timed(timings["extract_fields"], extract_resume_fields, text, doc, path, sections)
+            _timed(timings["skill_match"], matcher.match, text)
+            _timed(timings["parse_birthday"], lambda: [_parse_birthday(d) for d in dates])
+            _timed(timings["scan_pdf"], scan_pdf, path)
+    return {stage: summarize(samples) for stage, samples in timings.items()}
+
+
+def _timed(samples, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    samples.append(time.perf_counter() - started)
+    return result
+
+
+def compare(current: dict, baseline: dict, threshold: float):
+    """Per-stage p50 change vs the baseline; returns (lines, regressed stage names)."""
+    lines, regressions = [], []
+    for stage, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before.get("p50_ms") or stats["p50_ms"] is None:
+            lines.append(f"{stage:16} {_ms(stats['p50_ms']):>10} ms   (no baseline)")
+            continue
+        change = stats["p50_ms"] / before["p50_ms"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(stage)
+        lines.append(f"{stage:16} {before['p50_ms']:>10} -> {stats['p50_ms']:>10} ms  {change:+.1%}{flag}")
+    return lines, regressions
+
+
+def _ms(value):
+    # Stages with no samples report p50_ms as None
+    return "n/a" if value is None else value
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark resume parsing stages on a synthetic PDF corpus.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--per-case", type=int, default=5, help="documents per (layout, page count) case")
+    parser.add_argument("--pages", default="1,2,5,40", help="comma-separated page counts")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus")
+    parser.add_argument("--dates-per-doc", type=int, default=50, help="date strings parsed per document")
+    parser.add_argument("--corpus-dir", help="keep the generated PDFs here (default: a temporary directory)")
+    parser.add_argument("--output", help="write the JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed p50 slowdown before failing, e.g. 0.10 = 10%%")
+    args = parser.parse_args(argv)
+
+    page_counts = tuple(int(p) for p in args.pages.split(","))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = generate_corpus(args.corpus_dir or tmp_dir, seed=args.seed, page_counts=page_counts, per_case=args.per_case)
+        stages = run(corpus, args.repeat, args.dates_per_doc, args.seed)
+
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "parser_version": PARSER_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "documents": len(corpus),
+            "pages": list(page_counts),
+            "corpus_bytes": sum(size for _, _, _, size in corpus),
+            "repeat": args.repeat,
+        },
+        "stages": stages,
+    }
+    rendered = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(rendered + "\n")
+    else:
+        print(rendered)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressions = compare(result, baseline, args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        if regressions:
+            print(f"Slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+End-to-end HTTP load test of the API.
+
+    python -m benchmarks.load_test [--concurrency 16] [--duration 60] [--workers 1] [--output load.json]
+    python -m benchmarks.load_test --mix "upload=1,list=10,detail=10" --duration 30
+    python -m benchmarks.load_test --url http://127.0.0.1:8000   # an already running server
+
+By default it creates a throwaway SQLite database (schema via create_all), boots
+`uvicorn app.main:app` against it in a temporary directory, waits for /ready, registers and
+logs in a few users and seeds some resumes. Then `--concurrency` threads send a weighted mix of
+register, login, upload, list, detail, PDF, update and delete requests for `--duration`
+seconds. The report has, per endpoint: requests, throughput, p50/p95/p99 latency, error rate
+and status codes (JSON with --output). Uploads are unique synthetic PDFs, so every one is
+really parsed.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+import requests
+from benchmarks.stats import summarize
+from benchmarks.synthetic_pdf import LAYOUTS, skill_names, render_pdf, resume_sections
+
+DEFAULT_MIX = "register=0.2,login=0.5,upload=1,list=6,detail=6,pdf=3,update=1,delete=0.3"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoadTest:
+    def __init__(self, base_url: str, mix: dict[str, float], seed: int = 1234):
+        self.base_url = base_url.rstrip("/")
+        self.ops = list(mix)
+        self.weights = [mix[op] for op in self.ops]
+        self.seed = seed
+        self.skills = skill_names()
+        self.users = []         # (email, password, token)
+        self.resume_ids = []    # known resume ids, fed by list responses
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    # ---- setup ----
+
+    def register_users(self, count: int):
+        with requests.Session() as http:
+            for _ in range(count):
+                self._register(http, random.Random(self.seed))
+
+    def seed_resumes(self, count: int):
+        rng = random.Random(self.seed)
+        with requests.Session() as http:
+            for _ in range(count):
+                self._upload(http, rng)
+            self._list(http, rng)
+
+    # ---- run ----
+
+    def run(self, concurrency: int, duration: float):
+        deadline = time.perf_counter() + duration
+        threads = [
+            threading.Thread(target=self._worker, args=(random.Random(self.seed + i + 1), deadline), daemon=True)
+            for i in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+    def _worker(self, rng, deadline):
+        with requests.Session() as http:
+            while time.perf_counter() < deadline:
+                op = rng.choices(self.ops, weights=self.weights)[0]
+                try:
+                    getattr(self, f"_{op}")(http, rng)
+                except requests.RequestException as e:
+                    self._record(op, 0, None, type(e).__name__)
+
+    def report(self, duration: float):
+        endpoints = {}
+        for op in sorted(self.latencies):
+            samples = self.latencies[op]
+            statuses = self.statuses[op]
+            errors = sum(n for status, n in statuses.items() if not (isinstance(status, int) and status < 400))
+            endpoints[op] = {
+                **summarize(samples, duration),
+                "errors": errors,
+                "error_rate": round(errors / len(samples), 4) if samples else None,
+                "statuses": {str(status): n for status, n in sorted(statuses.items(), key=str)},
+            }
+        return endpoints
+
+    # ---- operations (one request each) ----
+
+    def _request(self, http, op, method, path, **kwargs):
+        started = time.perf_counter()
+        response = http.request(method, self.base_url + path, timeout=120, **kwargs)
+        self._record(op, time.perf_counter() - started, response.status_code)
+        return response
+
+    def _record(self, op, elapsed, status, error=None):
+        with self._lock:
+            self.latencies[op].append(elapsed)
+            self.statuses[op][status if status is not None else error] += 1
+
+    def _register(self, http, rng):
+        n = next(self._counter)
+        email, password = f"load{n}-{os.getpid()}@example.com", f"pw-{n}"
+        response = self._request(http, "register", "POST", "/user/register",
+                                 json={"username": f"load{n}", "email": email, "password": password})
+        if response.ok:
+            token = self._request(http, "login", "POST", "/user/login", json={"email": email, "password": password}).json().get("access_token")
+            with self._lock:
+                self.users.append((email, password, token))
+
+    def _login(self, http, rng):
+        if not self.users:
+            return self._register(http, rng)
+        email, password, _ = rng.choice(self.users)
+        self._request(http, "login", "POST", "/user/login", json={"email": email, "password": password})
+
+    def _upload(self, http, rng):
+        if not self.users:
+            return self._register(http, rng)
+        _, _, token = rng.choice(self.users)
+        layout = rng.choice(LAYOUTS)
+        pdf = render_pdf(*resume_sections(rng, rng.choice((1, 1, 2)), layout, self.skills), layout)
+        self._request(http, "upload", "POST", "/resume/upload",
+                      files={"resume": (f"load-{next(self._counter)}.pdf", pdf, "application/pdf")},
+                      headers={"Authorization": f"Bearer {token}"})
+
+    def _list(self, http, rng):
+        response = self._request(http, "list", "GET", "/resume/list", params={"page": rng.randint(1, 3), "page_size": 20})
+        if response.ok:
+            ids = [row["resume_id"] for row in response.json().get("data", [])]
+            with self._lock:
+                known = set(self.resume_ids)
+                self.resume_ids.extend(i for i in ids if i not in known)
+
+    def _pick_resume(self, rng, remove=False):
+        with self._lock:
+            if not self.resume_ids:
+                return None
+            index = rng.randrange(len(self.resume_ids))
+            return self.resume_ids.pop(index) if remove else self.resume_ids[index]
+
+    def _detail(self, http, rng):
+        resume_id = self._pick_resume(rng)
+        if resume_id is None:
+            return self._list(http, rng)
+        self._request(http, "detail", "GET", f"/resume/resume/{resume_id}")
+
+    def _pdf(self, http, rng):
+        resume_id = self._pick_resume(rng)
+        if resume_id is None:
+            return self._list(http, rng)
+        self._request(http, "pdf", "GET", f"/resume/resume/{resume_id}/pdf")
+
+    def _update(self, http, rng):
+        resume_id = self._pick_resume(rng)
+        if resume_id is None:
+            return self._list(http, rng)
+        self._request(http, "update", "PUT", f"/resume/{resume_id}",
+                      json={"area": f"Area {rng.randint(1, 50)}", "skills": rng.sample(self.skills, k=5)})
+
+    def _delete(self, http, rng):
+        # Taken out of the pool first so other threads stop picking it
+        resume_id = self._pick_resume(rng, remove=True)
+        if resume_id is None:
+            return self._list(http, rng)
+        self._request(http, "delete", "DELETE", f"/resume/remove/{resume_id}")
+
+
+# ---- local server ----
+
+def start_local_server(work_dir: str, workers: int, port: int):
+    """Create a SQLite database in `work_dir` and boot uvicorn on it; returns (process, base_url)."""
+    database_url = f"sqlite:///{os.path.join(work_dir, 'load.db')}"
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "ASYNC_DATABASE_URL": "",
+        "RESUME_SEARCH_INDEX_PATH": os.path.join(work_dir, "resume_search.db"),
+        "PYTHONPATH": os.pathsep.join(p for p in (REPO_ROOT, os.environ.get("PYTHONPATH")) if p),
+    }
+    # The app has no migrations; create the schema the same way a fresh database would need it
+    subprocess.run([sys.executable, "-c", _CREATE_SCHEMA], env=env, cwd=work_dir, check=True)
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, cwd=work_dir,
+    )
+    return process, f"http://127.0.0.1:{port}"
+
+
+_CREATE_SCHEMA = """
+from app.config.database import Base, engine
+import app.model.entities, app.model.resume
+Base.metadata.create_all(engine)
+"""
+
+
+def wait_until_ready(base_url: str, process=None, timeout: float = 180):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/ready", timeout=5).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{base_url} not ready after {timeout}s")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _parse_mix(mix: str):
+    weights = {}
+    for part in mix.split(","):
+        op, _, weight = part.partition("=")
+        op = op.strip()
+        if not hasattr(LoadTest, f"_{op}"):
+            raise SystemExit(f"Unknown operation in --mix: {op}")
+        weights[op] = float(weight or 1)
+    return {op: w for op, w in weights.items() if w > 0}
+
+
+def _print_table(endpoints, duration):
+    print(f"\n{'endpoint':10} {'requests':>9} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}", file=sys.stderr)
+    for op, stats in endpoints.items():
+        print(f"{op:10} {stats['count']:>9} {stats['throughput_per_s']:>8} {stats['p50_ms']:>9} "
+              f"{stats['p95_ms']:>9} {stats['p99_ms']:>9} {stats['error_rate']:>8.2%}", file=sys.stderr)
+    print(f"({duration:.1f}s)", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP load test of the resume API.")
+    parser.add_argument("--url", help="test a running server instead of booting one (it must have a database)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for the local server")
+    parser.add_argument("--concurrency", type=int, default=16, help="client threads")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="relative weights per operation")
+    parser.add_argument("--users", type=int, default=5, help="users registered before the run")
+    parser.add_argument("--seed-resumes", type=int, default=20, help="resumes uploaded before the run")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="write the JSON report to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        process = None
+        base_url = args.url
+        if not base_url:
+            process, base_url = start_local_server(work_dir, args.workers, _free_port())
+        try:
+            wait_until_ready(base_url, process)
+            load_test = LoadTest(base_url, _parse_mix(args.mix), seed=args.seed)
+            load_test.register_users(args.users)
+            load_test.seed_resumes(args.seed_resumes)
+            # Setup requests are not part of the report
+            load_test.latencies.clear()
+            load_test.statuses.clear()
+
+            duration = load_test.run(args.concurrency, args.duration)
+            endpoints = load_test.report(duration)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+    result = {
+        "meta": {
+            "url": args.url or "local",
+            "workers": args.workers if not args.url else None,
+            "concurrency": args.concurrency,
+            "duration_s": round(duration, 3),
+            "mix": _parse_mix(args.mix),
+        },
+        "endpoints": endpoints,
+    }
+    _print_table(endpoints, duration)
+    rendered = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(rendered + "\n")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Latency summaries shared by the benchmark scripts."""
+
+
+def summarize(samples, duration_s=None):
+    """
+    count, throughput, mean and nearest-rank p50/p95/p99 (milliseconds) of `samples` in seconds.
+    Throughput is per second of `duration_s` (wall clock, for concurrent runs) or of the samples' sum.
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    elapsed = duration_s if duration_s is not None else total
+    return {
+        "count": len(ordered),
+        "total_s": round(total, 6),
+        "throughput_per_s": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "mean_ms": round(total / len(ordered) * 1000, 4) if ordered else None,
+        "p50_ms": percentile_ms(ordered, 50),
+        "p95_ms": percentile_ms(ordered, 95),
+        "p99_ms": percentile_ms(ordered, 99),
+    }
+
+
+def percentile_ms(ordered, pct):
+    # Nearest-rank percentile of sorted seconds, in milliseconds
+    if not ordered:
+        return None
+    rank = max(1, -(-pct * len(ordered) // 100))
+    return round(ordered[rank - 1] * 1000, 4)
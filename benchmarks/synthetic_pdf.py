@@ -0,0 +1,161 @@
+"""
+Deterministic synthetic resume PDFs for the parsing benchmarks.
+
+Everything is generated from a seed with a small hand-written PDF writer (Helvetica text
+runs, no external dependencies), so the same seed always yields byte-identical files and
+runs on different machines or commits parse exactly the same corpus.
+"""
+import json
+import os
+import random
+from app.config.resume_config import ResumeConfig
+
+FIRST_NAMES = ["James", "Maria", "Wei", "Aisha", "Carlos", "Yuki", "Olga", "Samuel", "Priya", "Liam", "Fatima", "Noah"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Khan", "Silva", "Tanaka", "Ivanova", "Okafor", "Patel", "Murphy", "Haddad", "Berg"]
+CITIES = ["Boston", "Seattle", "Austin", "Chicago", "Toronto", "London", "Berlin", "Singapore", "Sydney", "Denver"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli", "Vandelay"]
+TITLES = ["Software Engineer", "Data Analyst", "Backend Developer", "DevOps Engineer", "Product Manager", "ML Engineer"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "Polytechnic University"]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "BEng Software Engineering", "MBA"]
+VERBS = ["Built", "Designed", "Migrated", "Scaled", "Automated", "Led", "Optimized", "Maintained"]
+OBJECTS = ["the billing pipeline", "a search service", "internal dashboards", "the CI system",
+           "customer APIs", "a data warehouse", "mobile backends", "the reporting stack"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July", "August",
+               "September", "October", "November", "December"]
+
+LAYOUTS = ("single", "two_column", "dense")
+
+# Layout: (font size, leading, main column x, sidebar x or None)
+_LAYOUT_METRICS = {
+    "single": (10, 14, 50, None),
+    "two_column": (10, 14, 50, 400),
+    "dense": (7, 9, 40, None),
+}
+_PAGE_WIDTH, _PAGE_HEIGHT, _MARGIN = 612, 792, 40
+
+
+def skill_names():
+    with open(ResumeConfig.SKILL_TAXONOMY_PATH, encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    return sorted(taxonomy)
+
+
+def random_date_string(rng: random.Random) -> str:
+    """A date in one of the formats resumes use (and _parse_birthday handles, or not)."""
+    year, month, day = rng.randint(1960, 2004), rng.randint(1, 12), rng.randint(1, 28)
+    return rng.choice([
+        f"{year}",
+        f"{MONTHS[month - 1]} {year}",
+        f"{MONTH_NAMES[month - 1]} {year}",
+        f"{year}-{month:02d}-{day:02d}",
+        f"{day} {MONTHS[month - 1]} {year}",
+        f"{day} {MONTH_NAMES[month - 1]} {year}",
+        f"{MONTHS[month - 1]} {year} - {MONTHS[rng.randint(0, 11)]} {year + rng.randint(1, 5)}",
+        f"{month}/{day}/{year}",
+    ])
+
+
+def resume_sections(rng: random.Random, pages: int, layout: str, skills: list[str]):
+    """(main column lines, sidebar lines) for one resume, long enough to fill `pages` pages."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    city = rng.choice(CITIES)
+    phone = f"({rng.randint(200, 989)}) {rng.randint(200, 989)}-{rng.randint(1000, 9999)}"
+    chosen_skills = rng.sample(skills, k=min(len(skills), rng.randint(5, 25)))
+
+    header = [name, f"{city}  |  {phone}  |  {name.split()[0].lower()}@example.com", f"Born: {random_date_string(rng)}", ""]
+    main = header + ["Summary", f"{rng.choice(TITLES)} with {rng.randint(2, 20)} years of experience.", ""]
+    main.append("Work Experience")
+    for _ in range(rng.randint(2, 5)):
+        start = rng.randint(2000, 2020)
+        main.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)}  {start} - {start + rng.randint(1, 4)}")
+        for _ in range(rng.randint(2, 4)):
+            main.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(chosen_skills)}")
+    main += ["", "Education", f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {rng.randint(1985, 2020)}", ""]
+
+    skill_lines = ["Skills"] + [", ".join(chosen_skills[i:i + 5]) for i in range(0, len(chosen_skills), 5)]
+    sidebar = []
+    if layout == "two_column":
+        sidebar = skill_lines
+    else:
+        main += skill_lines + [""]
+
+    # Portfolio projects pad the document to the requested page count
+    _, leading, _, _ = _LAYOUT_METRICS[layout]
+    lines_per_page = (_PAGE_HEIGHT - 2 * _MARGIN) // leading
+    if pages > 1 or len(main) < lines_per_page:
+        main.append("Projects")
+    project = 1
+    while len(main) < lines_per_page * (pages - 1) + lines_per_page // 2:
+        main.append(f"Project {project}: {rng.choice(VERBS)} {rng.choice(OBJECTS)} for {rng.choice(COMPANIES)}")
+        main.append(f"  Stack: {', '.join(rng.sample(chosen_skills, k=min(3, len(chosen_skills))))}; "
+                    f"{rng.randint(2, 40)} contributors, {rng.randint(1, 36)} months.")
+        project += 1
+    return main, sidebar
+
+
+def render_pdf(main_lines: list[str], sidebar_lines: list[str], layout: str) -> bytes:
+    size, leading, main_x, sidebar_x = _LAYOUT_METRICS[layout]
+    lines_per_page = (_PAGE_HEIGHT - 2 * _MARGIN) // leading
+    pages = []
+    for start in range(0, max(len(main_lines), 1), lines_per_page):
+        runs = []
+        for row, line in enumerate(main_lines[start:start + lines_per_page]):
+            runs.append((main_x, _PAGE_HEIGHT - _MARGIN - row * leading, size, line))
+        if sidebar_x is not None and not pages:
+            for row, line in enumerate(sidebar_lines):
+                runs.append((sidebar_x, _PAGE_HEIGHT - _MARGIN - row * leading, size, line))
+        pages.append(runs)
+    return build_pdf(pages)
+
+
+def build_pdf(pages: list[list[tuple]]) -> bytes:
+    """A minimal valid PDF: one Helvetica text run per (x, y, size, text) tuple, one list per page."""
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for runs in pages:
+        content = b"".join(
+            b"BT /F1 %d Tf %d %d Td (%s) Tj ET\n" % (size, x, y, _escape(text)) for x, y, size, text in runs
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (_PAGE_WIDTH, _PAGE_HEIGHT, content_id)
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % i for i in page_ids), len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def _escape(text: str) -> bytes:
+    return text.encode("latin-1", "replace").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def generate_corpus(directory: str, seed: int = 1234, page_counts=(1, 2, 5, 40), layouts=LAYOUTS, per_case: int = 5):
+    """Write the corpus into `directory`; returns [(path, layout, pages, size_bytes)] in a stable order."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    skills = skill_names()
+    corpus = []
+    for layout in layouts:
+        for pages in page_counts:
+            for i in range(per_case):
+                main, sidebar = resume_sections(rng, pages, layout, skills)
+                data = render_pdf(main, sidebar, layout)
+                path = os.path.join(directory, f"{layout}-{pages:02d}p-{i:03d}.pdf")
+                with open(path, "wb") as f:
+                    f.write(data)
+                corpus.append((path, layout, pages, len(data)))
+    return corpus
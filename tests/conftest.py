@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+# The app reads its settings at import time: point it at a throwaway SQLite database and
+# search index before anything under app/ is imported
+_work_dir = tempfile.mkdtemp(prefix="resume-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_work_dir, 'test.db')}")
+os.environ.setdefault("RESUME_SEARCH_INDEX_PATH", os.path.join(_work_dir, "resume_search.db"))
+os.environ.setdefault("SPACY_WARMUP", "false")
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def database():
+    from app.config.database import Base, engine
+    import app.model.entities, app.model.resume  # noqa: F401  (register the tables)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db_session(database):
+    from app.config.database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(database):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(database):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    credentials = {"email": "tester@example.com", "password": "test-password"}
+    with TestClient(app) as test_client:
+        test_client.post("/user/register", json={"username": "tester", **credentials})
+        token = test_client.post("/user/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    # Uploads are written to ./resumes
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "resumes"
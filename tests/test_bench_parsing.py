@@ -0,0 +1,11 @@
+from benchmarks.bench_parsing import compare
+
+
+def test_compare_reports_stages_without_samples():
+    current = {"stages": {"ner": {"p50_ms": None}, "ocr": {"p50_ms": 2.0}}}
+    baseline = {"stages": {"ner": {"p50_ms": 1.0}, "ocr": {"p50_ms": 1.0}}}
+
+    lines, regressions = compare(current, baseline, threshold=0.10)
+
+    assert "n/a ms" in lines[0] and "(no baseline)" in lines[0]
+    assert regressions == ["ocr"]
@@ -0,0 +1,73 @@
+import pytest
+from app.utils.bitmap_index import SkillBitmapIndex
+
+DOCS = [
+    {"resume_id": "a", "skills": ["python", "sql"], "area": "Boston"},
+    {"resume_id": "b", "skills": ["python", "java"], "area": "New York"},
+    {"resume_id": "c", "skills": ["java"], "area": "Boston"},
+    {"resume_id": "d", "skills": ["go", "kubernetes"], "area": None},
+]
+
+
+@pytest.fixture
+def index():
+    index = SkillBitmapIndex()
+    index.load(DOCS)
+    return index
+
+
+def _ids(index, expression):
+    total, ids = index.filter(expression)
+    assert total == len(ids)
+    return set(ids)
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("python", {"a", "b"}),
+    ("python AND sql", {"a"}),
+    ("python sql", {"a"}),  # AND is implied between terms
+    ("python && sql", {"a"}),
+    ("sql OR java", {"a", "b", "c"}),
+    ("sql | java", {"a", "b", "c"}),
+    ("NOT python", {"c", "d"}),
+    ("! python", {"c", "d"}),
+    ("NOT NOT python", {"a", "b"}),
+    ("python OR java AND area:boston", {"a", "b", "c"}),  # AND binds tighter than OR
+    ("(python OR java) AND area:boston", {"a", "c"}),
+    ('area:"new york"', {"b"}),
+    ('"area:New York"', {"b"}),
+    ("java AND NOT (area:boston)", {"b"}),
+    ("rust", set()),
+])
+def test_filter_expressions(index, expression, expected):
+    assert _ids(index, expression) == expected
+
+
+def test_terms_resolve_skill_aliases(index):
+    assert _ids(index, "golang") == {"d"}
+    assert _ids(index, "k8s") == {"d"}
+    assert _ids(index, "skill:Python3") == {"a", "b"}
+    assert _ids(index, "PYTHON") == {"a", "b"}
+
+
+@pytest.mark.parametrize("expression", ["", "   ", "python AND", "(python", "python)", "AND python", "python OR OR sql", "()"])
+def test_malformed_expressions_are_rejected(index, expression):
+    with pytest.raises(ValueError):
+        index.filter(expression)
+
+
+def test_filter_pages_through_matches(index):
+    total, first = index.filter("python OR java", offset=0, limit=2)
+    _, rest = index.filter("python OR java", offset=2, limit=2)
+    assert total == 3
+    assert len(first) == 2 and len(rest) == 1
+    assert set(first + rest) == {"a", "b", "c"}
+
+
+def test_writes_update_the_index(index):
+    index.upsert({"resume_id": "c", "skills": ["python"], "area": "Denver"})
+    index.remove("a")
+    assert _ids(index, "python") == {"b", "c"}
+    assert _ids(index, "java") == {"b"}
+    assert _ids(index, "area:boston") == set()
+    assert _ids(index, "NOT python") == {"d"}  # removed resumes don't match a negation either
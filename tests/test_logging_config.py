@@ -0,0 +1,34 @@
+import logging
+from app.config.logging_config import RateLimitFilter
+
+
+def _record(name, level=logging.INFO, lineno=10):
+    return logging.LogRecord(name, level, "module.py", lineno, "row %s", (1,), None)
+
+
+def test_only_configured_loggers_are_limited():
+    rate_limit = RateLimitFilter(limit=2, window=60, loggers=["sqlalchemy.engine"])
+
+    limited = [rate_limit.filter(_record("sqlalchemy.engine.Engine")) for _ in range(5)]
+    other = [rate_limit.filter(_record("app.service.resume_service")) for _ in range(5)]
+
+    assert limited == [True, True, False, False, False]
+    assert all(other)
+
+
+def test_warnings_always_pass():
+    rate_limit = RateLimitFilter(limit=1, window=60, loggers=["app"])
+
+    assert all(rate_limit.filter(_record("app.repository", logging.WARNING)) for _ in range(5))
+
+
+def test_suppressed_count_is_reported_in_the_next_window():
+    rate_limit = RateLimitFilter(limit=1, window=60, loggers=["app"])
+    rate_limit.filter(_record("app.x"))
+    for _ in range(3):
+        rate_limit.filter(_record("app.x"))
+    rate_limit.window = 0  # the next record opens a new window
+
+    record = _record("app.x")
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "row 1 (3 similar messages suppressed)"
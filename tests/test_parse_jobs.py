@@ -0,0 +1,59 @@
+import asyncio
+import time
+from datetime import datetime
+from app.config.database import AsyncSessionLocal
+from app.model.resume import ParseJobRecord
+from app.service.resume_service import process_parse_job
+from app.utils.parse_jobs import parse_jobs
+
+
+def _wait_for_job(client, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/resume/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_state_is_stored_in_the_table(client, db_session, auth_headers, upload_dir):
+    response = client.post(
+        "/resume/upload",
+        params={"async_parse": "true"},
+        files={"resume": ("broken.pdf", b"%PDF-1.4\nnot really a pdf", "application/pdf")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 202
+    job = _wait_for_job(client, response.json()["job_id"])
+
+    assert job["status"] == "failed"
+    assert job["error"].startswith("Error scanning the PDF")
+    # What another API worker would read
+    record = db_session.get(ParseJobRecord, job["job_id"])
+    assert (record.status, record.error) == ("failed", job["error"])
+    assert record.finished_at is not None
+
+
+def test_recover_requeues_jobs_of_a_dead_worker(client, tmp_path):
+    file_path = tmp_path / "left-behind.pdf"
+    file_path.write_bytes(b"%PDF-1.4\nnot really a pdf")
+    dead_owner = f"{parse_jobs.host}:999999999"
+
+    async def recover():
+        async with AsyncSessionLocal() as db:
+            for job_id, path in (("recover-file", str(file_path)), ("recover-missing", str(tmp_path / "gone.pdf"))):
+                db.add(ParseJobRecord(
+                    job_id=job_id, filename="left-behind.pdf", file_path=path, operator="tester",
+                    status="running", owner=dead_owner, created_at=datetime.utcnow(),
+                ))
+            await db.commit()
+        await parse_jobs.recover(process_parse_job)
+        await asyncio.gather(*parse_jobs._tasks)
+        return [await parse_jobs.get(job_id) for job_id in ("recover-file", "recover-missing")]
+
+    requeued, missing = asyncio.run(recover())
+
+    assert requeued.status == "failed" and requeued.error.startswith("Error scanning the PDF")
+    assert not file_path.exists()
+    assert missing.status == "failed" and missing.error == "The uploaded file is missing."
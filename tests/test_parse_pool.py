@@ -0,0 +1,20 @@
+import asyncio
+import time
+from app.utils.metrics import registry
+from app.utils.parse_pool import run_in_parse_pool
+
+
+def _in_flight():
+    [line] = [line for line in registry.render().splitlines() if line.startswith("parse_pool_tasks ")]
+    return float(line.split()[1])
+
+
+def test_pool_calls_are_counted_until_they_finish():
+    async def scenario():
+        call = asyncio.ensure_future(run_in_parse_pool(time.sleep, 0.5))
+        await asyncio.sleep(0.1)
+        during = _in_flight()
+        await call
+        return during, _in_flight()
+
+    assert asyncio.run(scenario()) == (1, 0)
@@ -0,0 +1,86 @@
+import math
+import random
+import pytest
+from app.utils import ranking
+from app.utils.ranking import ResumeRanker, _document_terms
+
+WORDS = "python django backend api cloud kubernetes data pipeline frontend react design database".split()
+
+
+def _doc(resume_id, rng):
+    return {
+        "resume_id": resume_id,
+        "name": resume_id,
+        "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 30))),
+        "skills": rng.sample(["Python", "Rust", "Go", "SQL"], rng.randint(0, 2)),
+    }
+
+
+def _reference_scores(docs, query_terms, k1=1.5, b=0.75):
+    terms = {resume_id: _document_terms(doc) for resume_id, doc in docs.items()}
+    n_docs = len(docs)
+    avg_len = sum(sum(t.values()) for t in terms.values()) / n_docs
+    scores = {}
+    for resume_id, counts in terms.items():
+        length = sum(counts.values())
+        score = 0.0
+        for term, weight in query_terms.items():
+            tf = counts.get(term, 0)
+            if not tf:
+                continue
+            df = sum(1 for other in terms.values() if term in other)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            score += weight * idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_len))
+        if score > 0:
+            scores[resume_id] = score
+    return scores
+
+
+@pytest.fixture
+def ranker(monkeypatch):
+    # Merge often, so the tests cover rows both in the merged matrix and in the delta
+    monkeypatch.setattr(ranking, "_MERGE_MIN_NNZ", 50)
+    return ResumeRanker()
+
+
+def test_scores_match_bm25_through_upserts_and_removes(ranker):
+    rng = random.Random(7)
+    docs = {f"r{i}": _doc(f"r{i}", rng) for i in range(200)}
+    ranker.load(list(docs.values()))
+    for step in range(1500):
+        resume_id = f"r{rng.randrange(300)}"
+        if rng.random() < 0.3:
+            ranker.remove(resume_id)
+            docs.pop(resume_id, None)
+        else:
+            docs[resume_id] = _doc(resume_id, rng)
+            ranker.upsert(docs[resume_id])
+
+    expected = _reference_scores(docs, {"python": 1.0, "cloud": 1.0, "skill:python": 3.0})
+    for compacted in (False, True):
+        if compacted:
+            ranker._state.merge(compact=True)
+        ranked = ranker.rank("python cloud", top_k=len(docs))
+
+        assert {hit["resume_id"] for hit in ranked} == set(expected)
+        for hit in ranked:
+            assert hit["score"] == pytest.approx(expected[hit["resume_id"]], abs=1e-3)
+
+
+def test_skills_match_regardless_of_case(ranker):
+    ranker.load([
+        {"resume_id": "a", "name": "A", "text": "", "skills": ["Rust"]},
+        {"resume_id": "b", "name": "B", "text": "", "skills": ["Java"]},
+    ])
+
+    [hit] = ranker.rank("Looking for a rust developer")
+
+    assert hit["resume_id"] == "a"
+    assert hit["matched_skills"] == ["rust"]
+
+
+def test_removed_resumes_are_not_ranked(ranker):
+    ranker.load([{"resume_id": "a", "name": "A", "text": "kubernetes", "skills": []}])
+    ranker.remove("a")
+
+    assert ranker.rank("kubernetes") == []
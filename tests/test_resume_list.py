@@ -0,0 +1,67 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from app.model.resume import Position, ResumeDetail
+from app.service.resume_service import _decode_list_cursor, _encode_list_cursor
+
+
+def _seed(db_session, count):
+    # Inserted in one go, so most rows share gmt_create down to the second and the
+    # resume_id/position_id tie-breakers decide the order
+    for i in range(count):
+        resume = ResumeDetail(f"Person {i}", None, None, None, None, None, None, "seed", None)
+        db_session.add(resume)
+        db_session.flush()
+        db_session.add(Position(resume.resume_id, resume.name, None, "Engineer"))
+    db_session.commit()
+
+
+def test_cursor_pages_cover_every_resume_once(client, db_session):
+    _seed(db_session, 23)
+    expected = {row["resume_id"] for row in client.get("/resume/list", params={"page_size": 100}).json()["data"]}
+
+    seen = []
+    params = {"page_size": 5}
+    for _ in range(len(expected)):  # more pages than this means the cursor is not advancing
+        body = client.get("/resume/list", params=params).json()
+        seen.extend(row["resume_id"] for row in body["data"])
+        if not body["next_cursor"]:
+            break
+        params = {"page_size": 5, "cursor": body["next_cursor"]}
+    else:
+        raise AssertionError("cursor paging did not end")
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == expected
+
+
+def test_invalid_cursor_is_rejected(client):
+    for cursor in ("not-base64!", "WyIyMDI0LTAxLTAxIiwgMSwgMl0="):  # the second is ["2024-01-01", 1, 2]
+        assert client.get("/resume/list", params={"cursor": cursor}).status_code == 400
+
+
+def test_list_cursor_round_trips():
+    row = SimpleNamespace(gmt_create=datetime(2024, 5, 1, 9, 30, 15), resume_id=uuid.uuid4(), position_id=uuid.uuid4())
+    cursor = _encode_list_cursor(row)
+    assert not set(cursor) & set("+/")  # safe in a query string as is
+    assert _decode_list_cursor(cursor) == (row.gmt_create, row.resume_id, row.position_id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(json.dumps(["2024-05-01T09:30:15", "x"]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["yesterday", str(uuid.uuid4()), str(uuid.uuid4())]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["2024-05-01T09:30:15", "not-a-uuid", str(uuid.uuid4())]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps([1, 2, 3]).encode()).decode(),
+    "é",
+])
+def test_malformed_list_cursors_raise_400(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        _decode_list_cursor(cursor)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,21 @@
+from app.model.resume import ResumeDetail
+
+
+def test_changing_resume_url_drops_the_old_files_etag(client, db_session, tmp_path):
+    old_pdf, new_pdf = tmp_path / "old.pdf", tmp_path / "new.pdf"
+    old_pdf.write_bytes(b"%PDF-1.4 old")
+    new_pdf.write_bytes(b"%PDF-1.4 new content")
+    resume = ResumeDetail("Ada", None, None, None, None, None, str(old_pdf), "tester", None, content_hash="a" * 64)
+    db_session.add(resume)
+    db_session.commit()
+    pdf_url = f"/resume/resume/{resume.resume_id}/pdf"
+
+    old_etag = client.get(pdf_url).headers["etag"]
+    assert old_etag == f'"{"a" * 64}"'
+
+    assert client.put(f"/resume/{resume.resume_id}", json={"resume_url": str(new_pdf)}).status_code == 200
+    response = client.get(pdf_url, headers={"If-None-Match": old_etag})
+
+    assert response.status_code == 200
+    assert response.content == b"%PDF-1.4 new content"
+    assert response.headers["etag"] != old_etag
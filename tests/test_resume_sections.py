@@ -0,0 +1,58 @@
+from app.utils.resume_sections import HEADER_FALLBACK_CHARS, HEADER_MAX_CHARS, segment_resume
+
+RESUME = """Jane Doe
+Boston, MA
+
+WORK EXPERIENCE:
+Engineer at Acme, 2019 - 2023
+
+Education
+BSc Computer Science
+
+-- Technical Skills --
+Python, SQL
+
+Personal Details
+Date of Birth: 1990-01-01
+
+Hobbies
+Chess
+
+Experience
+Intern at Initech, 2018
+"""
+
+
+def test_lines_are_grouped_under_their_headings():
+    sections = segment_resume(RESUME)
+    assert sections["education"] == "BSc Computer Science"
+    assert sections["skills"] == "Python, SQL"
+    assert sections["other"] == "Chess"
+
+
+def test_repeated_sections_are_concatenated():
+    assert segment_resume(RESUME)["experience"] == "Engineer at Acme, 2019 - 2023\n\nIntern at Initech, 2018"
+
+
+def test_header_includes_personal_details_sections():
+    assert segment_resume(RESUME)["header"] == "Jane Doe\nBoston, MA\n\nDate of Birth: 1990-01-01"
+
+
+def test_heading_words_inside_sentences_are_not_headings():
+    text = "Skills\nPython\nExperience with Python and SQL for five years"
+    sections = segment_resume(text)
+    assert sections["skills"] == "Python\nExperience with Python and SQL for five years"
+    assert sections["experience"] == ""
+
+
+def test_text_without_headings_falls_back_to_its_start():
+    text = "Jane Doe " * 500
+    sections = segment_resume(text)
+    assert sections["header"] == text[:HEADER_FALLBACK_CHARS]
+    assert sections["experience"] == sections["education"] == sections["skills"] == ""
+
+
+def test_header_is_capped():
+    sections = segment_resume("x" * (HEADER_MAX_CHARS * 2) + "\nEducation\nBSc")
+    assert len(sections["header"]) == HEADER_MAX_CHARS
+    assert sections["education"] == "BSc"
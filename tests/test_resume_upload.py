@@ -0,0 +1,38 @@
+import asyncio
+import os
+from types import SimpleNamespace
+import pytest
+from app.service.resume_service import process_parse_job
+
+
+def test_corrupt_pdf_is_rejected_and_its_file_removed(client, auth_headers, upload_dir):
+    response = client.post(
+        "/resume/upload",
+        files={"resume": ("broken.pdf", b"%PDF-1.4\nnot really a pdf", "application/pdf")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Error scanning the PDF."
+    assert not os.listdir(upload_dir)
+
+
+def test_non_pdf_content_is_rejected(client, auth_headers, upload_dir):
+    response = client.post(
+        "/resume/upload",
+        files={"resume": ("fake.pdf", b"PK\x03\x04 a zip in disguise", "application/pdf")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 415
+    assert not os.listdir(upload_dir)
+
+
+def test_failed_parse_job_removes_its_file(tmp_path):
+    file_path = tmp_path / "queued.pdf"
+    file_path.write_bytes(b"%PDF-1.4\nnot really a pdf")
+    job = SimpleNamespace(file_path=str(file_path), operator="tester", content_hash=None)
+
+    with pytest.raises(ValueError, match="Error scanning the PDF"):
+        asyncio.run(process_parse_job(job))
+    assert not file_path.exists()
@@ -0,0 +1,81 @@
+import threading
+import pytest
+from app.utils.search_index import ResumeSearchIndex
+
+
+class FakeSource:
+    def __init__(self, docs):
+        self.docs = {doc["resume_id"]: doc for doc in docs}
+
+    def fingerprint(self):
+        return len(self.docs), max((d["gmt_modify"] for d in self.docs.values()), default=None)
+
+    def versions(self):
+        return {resume_id: doc["gmt_modify"] for resume_id, doc in self.docs.items()}
+
+    def documents(self, resume_ids):
+        return [self.docs[resume_id] for resume_id in resume_ids if resume_id in self.docs]
+
+
+def _doc(resume_id, modified, name="Ada", operator="hr", skills=("python",)):
+    return {
+        "resume_id": resume_id, "name": name, "skills": list(skills), "operator": operator,
+        "gmt_create": "2024-01-01T09:00:00", "gmt_modify": modified,
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ResumeSearchIndex(str(tmp_path / "search.db"))
+
+
+def test_sync_picks_up_missed_changes(index):
+    source = FakeSource([_doc("a", "2024-01-01T09:00:00"), _doc("b", "2024-01-01T09:00:00", name="Grace")])
+    index.sync(source)
+    assert index.search("ada")[0] == 1
+
+    # Changes this index never saw: a rename, a new resume and a deletion
+    source.docs["a"] = _doc("a", "2024-01-02T09:00:00", name="Lovelace")
+    source.docs["c"] = _doc("c", "2024-01-02T09:00:00", name="Hopper")
+    del source.docs["b"]
+    index.sync(source)
+
+    assert index.search("ada")[0] == 0
+    assert index.search("lovelace")[0] == 1
+    assert index.search("hopper")[0] == 1
+    assert index.search("grace")[0] == 0
+    assert index.fingerprint() == source.fingerprint()
+
+
+def test_concurrent_upserts_of_the_same_resume(index):
+    errors = []
+
+    def write():
+        try:
+            for i in range(50):
+                index.upsert_many([_doc(f"r{i}", "2024-01-01T09:00:00")])
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert index.count() == 50
+    assert index.search("ada", limit=100)[0] == 50
+
+
+def test_filters_without_terms(index):
+    index.upsert_many([
+        _doc("a", None, operator="hr"),
+        {**_doc("b", None, operator="ops"), "gmt_create": "2024-01-31T10:00:00"},
+    ])
+
+    total, hits = index.search("", created_to="2024-01-31T23:59:59.999999", created_from="2024-01-31T00:00:00")
+    assert (total, [hit["resume_id"] for hit in hits]) == (1, ["b"])
+    assert index.search("", operator="hr")[0] == 1
+    with pytest.raises(ValueError):
+        index.search("")
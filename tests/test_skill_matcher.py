@@ -0,0 +1,43 @@
+from app.utils.skill_matcher import SkillMatcher, get_skill_matcher, tokenize
+
+TAXONOMY = {
+    "Python": ["python3", "cpython"],
+    "c++": ["cpp", "c plus plus"],
+    "go": {"aliases": ["golang", "go lang"], "match_id": False},
+    "machine learning": ["ml"],
+    "learning": [],
+    "node.js": ["nodejs"],
+}
+
+
+def test_tokenize_keeps_skill_punctuation():
+    assert tokenize("C++, C#, Node.js and .NET. Python.") == ["c++", "c#", "node.js", "and", ".net", "python"]
+
+
+def test_aliases_resolve_to_the_lowercased_skill_id():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.match("CPython, C plus plus and NodeJS") == ["python", "c++", "node.js"]
+
+
+def test_ambiguous_ids_match_only_through_their_aliases():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.match("I like to go hiking") == []
+    assert matcher.match("Golang and Go lang") == ["go"]
+
+
+def test_longest_phrase_wins_and_matches_do_not_overlap():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.match("machine learning") == ["machine learning"]
+    assert matcher.match("learning machine learning") == ["learning", "machine learning"]
+
+
+def test_each_skill_is_reported_once_in_order_of_first_appearance():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.match("cpp, python3, c++, Python") == ["c++", "python"]
+
+
+def test_shipped_taxonomy_aliases():
+    matcher = get_skill_matcher()
+    assert matcher.match("golang") == ["go"]
+    assert matcher.match("k8s") == ["kubernetes"]
+    assert matcher.match("C Sharp") == ["c#"]